@@ -0,0 +1,401 @@
+"""
+HTTP serving load benchmark
+- Starts the API on a synthetic, fixture-populated snapshot store of
+  configurable size; every requested key is fresh, so nothing is scraped
+- Drives each route with concurrent keep-alive clients
+- Reports throughput, p50/p99 latency and server CPU per request, as the
+  median over --repeat trials
+- Compares against a stored baseline and exits non-zero on regressions
+  beyond both --tolerance and --min-delta-ms
+
+Usage:
+    python benchmarks/load_bench.py                      # run and compare
+    python benchmarks/load_bench.py --save-baseline      # record a new baseline
+    python benchmarks/load_bench.py --geos 50 --trends-per-category 40 --concurrency 32
+
+Baselines are machine-specific: record them on the machine that runs the
+comparison. Server CPU is read from /proc, so it is only reported on Linux.
+"""
+
+from http.client import HTTPConnection
+from pathlib import Path
+from typing import Dict, List, Optional
+import os
+import sys
+import json
+import math
+import time
+import random
+import statistics
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT / "src"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+ROUTES = ["/api/v1/{geo}", "/api/v1/{geo}/{category}", "/status", "/health"]
+
+sys.path.insert(0, str(SRC_DIR))
+
+from catalog import CATEGORIES, CATEGORY_NAMES, DEFAULT_GEOS, KNOWN_GEOS  # noqa: E402
+
+
+# Fixtures
+
+def fixture_geos(count: int) -> List[str]:
+    """Background geos first, then other known geos, so small sizes stay realistic"""
+    others = sorted(KNOWN_GEOS - set(DEFAULT_GEOS))
+    return (list(DEFAULT_GEOS) + others)[:count]
+
+
+def fixture_trend(rng: random.Random, geo: str, category_id: int, index: int) -> dict:
+    words = [f"{geo.lower()}term{rng.randrange(500)}" for _ in range(rng.randint(2, 8))]
+    return {
+        "category": CATEGORY_NAMES[category_id],
+        "category_id": category_id,
+        "trends": f"{words[0]} {index}",
+        "search_volume": f"{rng.choice([1, 2, 5, 10, 20, 50, 100, 200, 500])}K+",
+        "started": "October 19, 2026 at 9:00:00 AM UTC+5:30",
+        "ended": "",
+        "trend_breakdown": ",".join(words),
+        "explore_link": f"https://trends.google.com/trends/explore?q={words[0]}&geo={geo}&hl=en-US"
+    }
+
+
+def write_fixtures(cache_dir: Path, geos: List[str], trends_per_category: int, seed: int) -> int:
+    """Write one snapshot per geo in the same shape the worker publishes; returns total bytes"""
+    from refresh import build_snapshot
+
+    rng = random.Random(seed)
+    started_at = time.time()
+    total_bytes = 0
+    for geo in geos:
+        trends_by_category = {
+            category_id: [fixture_trend(rng, geo, category_id, i) for i in range(trends_per_category)]
+            for category_id in CATEGORY_NAMES
+        }
+        freshness = {
+            name: {
+                "category_id": category_id,
+                "status": "success",
+                "total_trends": trends_per_category,
+                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+            }
+            for category_id, name in CATEGORY_NAMES.items()
+        }
+        counters = {"successful": len(CATEGORY_NAMES), "failed": 0, "empty": 0, "peer": 0}
+        snapshot = build_snapshot(geo, trends_by_category, freshness, 1, counters, started_at, len(CATEGORY_NAMES))
+        path = cache_dir / f"{geo}_all.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        total_bytes += path.stat().st_size
+    return total_bytes
+
+
+# Server
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(cache_dir: Path, port: int, run_mode: str, log_path: Path) -> subprocess.Popen:
+    env = {
+        key: value for key, value in os.environ.items()
+        if key not in ("CLUSTER_CONFIG", "CLUSTER_DIR", "SEED_FROM", "ADMIN_TOKEN")
+    }
+    env.update({
+        "RUN_MODE": run_mode,
+        "CACHE_DIR": str(cache_dir),
+        "CACHE_TTL": "86400",
+        "SNAPSHOT_SYNC_SECONDS": "3600",  # Keep the disk poller out of the measurements
+        "PROFILE_DIR": str(cache_dir.parent / "profiles")
+    })
+    log = open(log_path, 'w')
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", str(SRC_DIR),
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=str(cache_dir.parent), env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    log.close()
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited during startup; see {log_path}")
+        try:
+            conn = HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"Server did not become healthy within 60s; see {log_path}")
+
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    """utime + stime of a process (Linux /proc only)"""
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+# Load generation
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def route_paths(route: str, geos: List[str]) -> List[str]:
+    slugs = [slug for slug in CATEGORIES if slug != "all"]
+    if route == "/api/v1/{geo}":
+        return [f"/api/v1/{geo}" for geo in geos]
+    if route == "/api/v1/{geo}/{category}":
+        return [f"/api/v1/{geo}/{slug}" for geo in geos for slug in slugs]
+    return [route]
+
+
+def drive(port: int, paths: List[str], total_requests: int, concurrency: int) -> dict:
+    """Issue total_requests GETs over `concurrency` keep-alive connections"""
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    barrier = threading.Barrier(concurrency + 1)
+
+    def client(slot: int, count: int):
+        conn = HTTPConnection("127.0.0.1", port, timeout=30)
+        barrier.wait()
+        for i in range(count):
+            path = paths[(slot + i * concurrency) % len(paths)]
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[slot] += 1
+            except OSError:
+                errors[slot] += 1
+                conn.close()
+                conn = HTTPConnection("127.0.0.1", port, timeout=30)
+            latencies[slot].append(time.perf_counter() - start)
+        conn.close()
+
+    share, extra = divmod(total_requests, concurrency)
+    threads = [
+        threading.Thread(target=client, args=(slot, share + (1 if slot < extra else 0)), daemon=True)
+        for slot in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    merged = sorted(latency for slot in latencies for latency in slot)
+    return {"elapsed": elapsed, "latencies": merged, "errors": sum(errors)}
+
+
+def bench_route(port: int, pid: int, route: str, geos: List[str], requests: int,
+                concurrency: int, warmup: int) -> dict:
+    paths = route_paths(route, geos)
+    drive(port, paths, warmup, concurrency)
+
+    cpu_before = process_cpu_seconds(pid)
+    run = drive(port, paths, requests, concurrency)
+    cpu_after = process_cpu_seconds(pid)
+
+    latencies = run["latencies"]
+    cpu_ms = None
+    if cpu_before is not None and cpu_after is not None:
+        cpu_ms = round((cpu_after - cpu_before) * 1000 / requests, 3)
+    return {
+        "requests": requests,
+        "errors": run["errors"],
+        "throughput_rps": round(requests / run["elapsed"], 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "cpu_ms_per_request": cpu_ms
+    }
+
+
+def median_trials(trials: List[dict]) -> dict:
+    """One route result from several trials: the median of each metric"""
+    result = {"trials": len(trials), "requests": trials[0]["requests"],
+              "errors": sum(trial["errors"] for trial in trials)}
+    for metric in ("throughput_rps", "p50_ms", "p99_ms", "mean_ms", "cpu_ms_per_request"):
+        values = [trial[metric] for trial in trials if trial[metric] is not None]
+        result[metric] = round(statistics.median(values), 3) if values else None
+    return result
+
+
+# Baseline comparison
+
+def compare(results: Dict[str, dict], baseline: dict, tolerance: float, min_delta_ms: float = 0.0) -> List[str]:
+    """
+    Human-readable regressions beyond tolerance (latency/CPU up, throughput down)
+
+    Latency and CPU must also have grown by at least min_delta_ms, so
+    sub-millisecond jitter on fast routes is not reported.
+    """
+    regressions = []
+    for route, current in results.items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous:
+            continue
+        if current["errors"] and not previous.get("errors"):
+            regressions.append(f"{route}: {current['errors']} errors (baseline had none)")
+        for metric in ("p50_ms", "p99_ms", "cpu_ms_per_request"):
+            old, new = previous.get(metric), current.get(metric)
+            if old and new is not None and new > old * (1 + tolerance) and new - old >= min_delta_ms:
+                regressions.append(f"{route}: {metric} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+        old, new = previous.get("throughput_rps"), current["throughput_rps"]
+        if old and new < old * (1 - tolerance):
+            regressions.append(f"{route}: throughput_rps {old} -> {new} ({(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_table(results: Dict[str, dict], baseline: Optional[dict]):
+    def delta(route, metric):
+        old = (baseline or {}).get("routes", {}).get(route, {}).get(metric)
+        new = results[route].get(metric)
+        if not old or new is None:
+            return ""
+        return f" ({(new / old - 1) * 100:+.0f}%)"
+
+    print(f"\n{'route':<28}{'req/s':>18}{'p50 ms':>18}{'p99 ms':>18}{'cpu ms/req':>18}{'errors':>8}")
+    for route, r in results.items():
+        cpu = "n/a" if r["cpu_ms_per_request"] is None else r["cpu_ms_per_request"]
+        print(
+            f"{route:<28}"
+            f"{str(r['throughput_rps']) + delta(route, 'throughput_rps'):>18}"
+            f"{str(r['p50_ms']) + delta(route, 'p50_ms'):>18}"
+            f"{str(r['p99_ms']) + delta(route, 'p99_ms'):>18}"
+            f"{str(cpu) + delta(route, 'cpu_ms_per_request'):>18}"
+            f"{r['errors']:>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-benchmark the API serving path")
+    parser.add_argument("--geos", type=int, default=len(DEFAULT_GEOS), help="Number of fixture geos (max %d)" % len(KNOWN_GEOS))
+    parser.add_argument("--trends-per-category", type=int, default=25, help="Fixture trends per category per geo")
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests per route")
+    parser.add_argument("--warmup", type=int, default=200, help="Unmeasured requests per route first")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client connections")
+    parser.add_argument("--routes", nargs="+", choices=ROUTES, default=ROUTES)
+    parser.add_argument("--run-mode", choices=["all", "api"], default="all",
+                        help="Server role; \"all\" also exercises the worker-side /health and /status paths")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--repeat", type=int, default=3, help="Trials per route; medians are reported (default 3)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (default 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Latency/CPU must also grow by this many ms to count as a regression (default 0.5)")
+    parser.add_argument("--output", type=Path, help="Also write the results JSON here")
+    args = parser.parse_args()
+
+    # In "all" mode every background geo needs a fresh fixture or startup would scrape it
+    min_geos = len(DEFAULT_GEOS) if args.run_mode == "all" else 1
+    config = {
+        "run_mode": args.run_mode,
+        "geos": max(min_geos, min(args.geos, len(KNOWN_GEOS))),
+        "trends_per_category": args.trends_per_category,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "repeat": max(1, args.repeat),
+        "seed": args.seed
+    }
+    geos = fixture_geos(config["geos"])
+
+    with tempfile.TemporaryDirectory(prefix="trends-bench-") as tmp:
+        cache_dir = Path(tmp) / "cache_data"
+        cache_dir.mkdir()
+        os.environ["CACHE_DIR"] = str(cache_dir)  # Before refresh/snapshot_store import
+        fixture_bytes = write_fixtures(cache_dir, geos, args.trends_per_category, args.seed)
+        print(f"📦 Fixture cache: {len(geos)} geos, {args.trends_per_category} trends/category, "
+              f"{fixture_bytes / 1024 / 1024:.1f} MB on disk")
+
+        port = free_port()
+        server = start_server(cache_dir, port, args.run_mode, Path(tmp) / "server.log")
+        try:
+            # Interleave routes across trials so a slow spell on the host is shared
+            trials: Dict[str, List[dict]] = {route: [] for route in args.routes}
+            for trial in range(1, config["repeat"] + 1):
+                for route in args.routes:
+                    print(f"🚀 {route}: {args.requests} requests x {args.concurrency} clients "
+                          f"(trial {trial}/{config['repeat']})")
+                    trials[route].append(bench_route(port, server.pid, route, geos, args.requests,
+                                                     args.concurrency, args.warmup))
+            results = {route: median_trials(runs) for route, runs in trials.items()}
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    report = {
+        "config": config,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "routes": results
+    }
+
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"\nℹ️ No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    if baseline.get("config") != config:
+        print(f"\n⚠️ Baseline was recorded with {baseline.get('config')}; comparison may not be meaningful")
+
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%} (and {args.min_delta_ms} ms):")
+        for line in regressions:
+            print(f"   - {line}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
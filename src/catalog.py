@@ -0,0 +1,67 @@
+"""
+Static catalog shared by the API and scraper roles
+- Geographies fetched in the background
+- Google Trends category slugs, ids and display names
+- Geography codes accepted by the API
+"""
+
+# Supported geographies for background fetching
+DEFAULT_GEOS = ["IN", "US", "GB", "AU", "CA"]  # Add more as needed
+
+# Categories mapping
+CATEGORIES = {
+    "all": 0,
+    "autos": 1,
+    "beauty": 2,
+    "business": 3,
+    "entertainment": 4,
+    "food": 5,
+    "games": 6,
+    "health": 7,
+    "hobbies": 8,
+    "education": 9,
+    "law": 10,
+    "other": 11,
+    "pets": 13,
+    "politics": 14,
+    "science": 15,
+    "shopping": 16,
+    "sports": 17,
+    "technology": 18,
+    "travel": 19,
+    "climate": 20
+}
+
+CATEGORY_NAMES = {
+    0: "All Categories",
+    1: "Autos and vehicles",
+    2: "Beauty and fashion",
+    3: "Business and finance",
+    4: "Entertainment",
+    5: "Food and drink",
+    6: "Games",
+    7: "Health",
+    8: "Hobbies and leisure",
+    9: "Jobs and education",
+    10: "Law and government",
+    11: "Other",
+    13: "Pets and animals",
+    14: "Politics",
+    15: "Science",
+    16: "Shopping",
+    17: "Sports",
+    18: "Technology",
+    19: "Travel and transportation",
+    20: "Climate"
+}
+
+CATEGORY_SLUGS = {category_id: slug for slug, category_id in CATEGORIES.items()}
+
+# Geographies served by Google Trends "Trending now" (ISO 3166-1 alpha-2)
+KNOWN_GEOS = {
+    "AR", "AT", "AU", "BE", "BG", "BR", "CA", "CH", "CL", "CO", "CZ", "DE",
+    "DK", "EE", "EG", "ES", "FI", "FR", "GB", "GR", "HK", "HR", "HU", "ID",
+    "IE", "IL", "IN", "IT", "JP", "KE", "KR", "LT", "LV", "MX", "MY", "NG",
+    "NL", "NO", "NZ", "PE", "PH", "PK", "PL", "PT", "RO", "RS", "RU", "SA",
+    "SE", "SG", "SI", "SK", "TH", "TR", "TW", "UA", "US", "VN", "ZA"
+} | set(DEFAULT_GEOS)
@@ -0,0 +1,244 @@
+"""
+Sharded (geo, category) ownership across scraper nodes
+- Consistent hash ring (virtual nodes) over the current membership
+- Membership from a static JSON file (CLUSTER_CONFIG) or from heartbeat
+  files in a shared directory (CLUSTER_DIR), re-read every heartbeat
+- Nodes scrape only the categories they own and copy the rest from the
+  owning peer's snapshot (GET /cluster/snapshot/{geo})
+- Only scraping roles join the ring; API-only replicas follow membership
+  as observers and never own shards
+
+With neither CLUSTER_CONFIG nor CLUSTER_DIR set, this node owns everything.
+
+CLUSTER_CONFIG format:
+    {"nodes": {"node-a": "http://10.0.0.1:8000", "node-b": "http://10.0.0.2:8000"}}
+"""
+
+from bisect import bisect
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote
+from urllib.request import urlopen
+import os
+import json
+import time
+import socket
+import hashlib
+import logging
+import threading
+
+from catalog import CATEGORY_NAMES, DEFAULT_GEOS
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_CONFIG = os.getenv("CLUSTER_CONFIG")  # Static membership file
+CLUSTER_DIR = os.getenv("CLUSTER_DIR")        # Shared heartbeat directory
+NODE_ID = os.getenv("CLUSTER_NODE_ID") or socket.gethostname()
+NODE_URL = os.getenv("CLUSTER_NODE_URL", "")
+HEARTBEAT_SECONDS = int(os.getenv("CLUSTER_HEARTBEAT_SECONDS", 10))
+PEER_TIMEOUT_SECONDS = int(os.getenv("CLUSTER_PEER_TIMEOUT", 5))
+VIRTUAL_NODES = 64
+
+
+def _hash(value: str) -> int:
+    return int(hashlib.md5(value.encode("utf-8")).hexdigest()[:16], 16)
+
+
+def shard_key(geo: str, category_id: int) -> str:
+    return f"{geo}:{category_id}"
+
+
+class HashRing:
+    """Consistent hash ring; adding/removing a node only moves its share of keys"""
+
+    def __init__(self, nodes: Iterable[str], replicas: int = VIRTUAL_NODES):
+        points = sorted(
+            (_hash(f"{node}#{i}"), node)
+            for node in nodes
+            for i in range(replicas)
+        )
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._hashes:
+            return None
+        index = bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
+class Cluster:
+    """Current membership, ring and peer snapshot access"""
+
+    def __init__(self):
+        self.enabled = bool(CLUSTER_CONFIG or CLUSTER_DIR)
+        self.members: Dict[str, str] = {NODE_ID: NODE_URL}
+        self.ring = HashRing([NODE_ID])
+        self.version = 0
+        self.joined = False
+        self._config_mtime = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # Membership
+
+    def _read_static_members(self) -> Optional[Dict[str, str]]:
+        path = Path(CLUSTER_CONFIG)
+        mtime = path.stat().st_mtime
+        if mtime == self._config_mtime:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            nodes = json.load(f)["nodes"]
+        self._config_mtime = mtime
+        if self.joined and NODE_ID not in nodes:
+            logger.warning(f"Node {NODE_ID} is not listed in {CLUSTER_CONFIG}; it will own nothing")
+        return nodes
+
+    def _heartbeat_members(self) -> Dict[str, str]:
+        directory = Path(CLUSTER_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        if self.joined:
+            heartbeat = directory / f"{NODE_ID}.json"
+            tmp_path = directory / f".{NODE_ID}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"url": NODE_URL, "heartbeat": time.time()}, f)
+            os.replace(tmp_path, heartbeat)
+
+        members = {}
+        cutoff = time.time() - 3 * HEARTBEAT_SECONDS
+        for member_file in directory.glob("*.json"):
+            try:
+                with open(member_file, 'r', encoding='utf-8') as f:
+                    info = json.load(f)
+                if info["heartbeat"] >= cutoff:
+                    members[member_file.stem] = info.get("url", "")
+            except Exception as e:
+                logger.error(f"Error reading cluster member {member_file.name}: {e}")
+        return members
+
+    def refresh_membership(self):
+        """Re-read membership and rebuild the ring when it changed"""
+        try:
+            members = self._read_static_members() if CLUSTER_CONFIG else self._heartbeat_members()
+        except Exception as e:
+            logger.error(f"Error refreshing cluster membership: {e}")
+            return
+        if members is None:
+            return
+        if not self.joined:
+            members = {node: url for node, url in members.items() if node != NODE_ID}
+        if members == self.members:
+            return
+
+        ring = HashRing(members.keys())
+        moved = sum(
+            1
+            for geo in DEFAULT_GEOS
+            for category_id in CATEGORY_NAMES
+            if ring.owner(shard_key(geo, category_id)) != self.ring.owner(shard_key(geo, category_id))
+        )
+        with self._lock:
+            joined = set(members) - set(self.members)
+            left = set(self.members) - set(members)
+            self.members = members
+            self.ring = ring
+            self.version += 1
+        logger.info(
+            f"🔀 Cluster membership v{self.version}: {sorted(members)} "
+            f"(joined: {sorted(joined)}, left: {sorted(left)}, {moved} shards moved)"
+        )
+
+    def _heartbeat_loop(self):
+        while not self._stop_event.wait(HEARTBEAT_SECONDS):
+            self.refresh_membership()
+
+    def start(self, join: bool = True):
+        """
+        Load membership and keep it current (no-op when clustering is off)
+
+        join=False follows the ring as an observer: the node heartbeats
+        nothing and owns no shards (API-only replicas, which never scrape).
+        """
+        if not self.enabled or self._thread is not None:
+            return
+        self.joined = join
+        if not join:
+            self.members, self.ring = {}, HashRing([])
+        if join and not NODE_URL:
+            logger.warning("CLUSTER_NODE_URL is not set; peers cannot copy this node's shards")
+        self._stop_event.clear()
+        self.refresh_membership()
+        self._thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop heartbeating and leave the cluster"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread = None
+        if CLUSTER_DIR and self.joined:
+            (Path(CLUSTER_DIR) / f"{NODE_ID}.json").unlink(missing_ok=True)
+
+    # Ownership
+
+    def owner(self, geo: str, category_id: int) -> Optional[str]:
+        """Owning node (None for an observer while no scraper node is up)"""
+        if not self.enabled:
+            return NODE_ID
+        with self._lock:
+            return self.ring.owner(shard_key(geo, category_id)) or (NODE_ID if self.joined else None)
+
+    def owns(self, geo: str, category_id: int) -> bool:
+        return self.owner(geo, category_id) == NODE_ID
+
+    def peers_for_geo(self, geo: str) -> List[str]:
+        """Other nodes owning categories of this geo, most categories first"""
+        counts: Dict[str, int] = {}
+        for category_id in CATEGORY_NAMES:
+            node = self.owner(geo, category_id)
+            if node and node != NODE_ID:
+                counts[node] = counts.get(node, 0) + 1
+        return sorted(counts, key=counts.get, reverse=True)
+
+    # Peer snapshots
+
+    def fetch_peer_snapshot(self, node: str, geo: str) -> Optional[dict]:
+        """A peer's current snapshot for a geo (it never scrapes to answer)"""
+        url = self.members.get(node)
+        if not url:
+            return None
+        try:
+            with urlopen(f"{url.rstrip('/')}/cluster/snapshot/{quote(geo)}", timeout=PEER_TIMEOUT_SECONDS) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except Exception as e:
+            logger.warning(f"Peer snapshot {geo} from {node} unavailable: {e}")
+            return None
+
+    def fetch_any_peer_snapshot(self, geo: str) -> Optional[dict]:
+        for node in self.peers_for_geo(geo):
+            snapshot = self.fetch_peer_snapshot(node, geo)
+            if snapshot:
+                return {**snapshot, "served_by_peer": node}
+        return None
+
+    def describe(self) -> dict:
+        with self._lock:
+            members = dict(self.members)
+            version = self.version
+        return {
+            "enabled": self.enabled,
+            "node_id": NODE_ID,
+            "role": "member" if self.joined else "observer",
+            "membership_source": "static" if CLUSTER_CONFIG else "heartbeat" if CLUSTER_DIR else None,
+            "membership_version": version,
+            "members": members,
+            "owned_shards": {
+                geo: [CATEGORY_NAMES[cid] for cid in CATEGORY_NAMES if self.owns(geo, cid)]
+                for geo in DEFAULT_GEOS
+            }
+        }
+
+
+cluster = Cluster()
@@ -0,0 +1,223 @@
+"""
+Refresh job queue
+- Identical jobs (same key) are deduplicated while queued or running
+- A fixed number of runner threads caps concurrent refreshes
+- Per-key cooldown after a job finishes
+- Bounded backlog and job history, with progress for GET /jobs/{id}
+- Optional on_update(job) hook on every state/progress change, used by the
+  worker to publish job state for API-only replicas
+"""
+
+from concurrent.futures import Future
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Optional, Tuple
+from datetime import datetime
+import os
+import time
+import uuid
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", 2))
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", 20))
+REFRESH_COOLDOWN_SECONDS = int(os.getenv("REFRESH_COOLDOWN_SECONDS", 120))
+JOB_HISTORY_SIZE = 200
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class JobRejected(Exception):
+    """A job was not queued (cooldown or full backlog)"""
+
+    def __init__(self, reason: str, message: str, retry_after: int = 0, last_job: Optional["Job"] = None):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+        self.last_job = last_job
+
+
+class Job:
+    """One refresh job and its progress"""
+
+    def __init__(self, key: str, func: Callable, description: str = ""):
+        self.id = new_job_id()
+        self.key = key
+        self.description = description or key
+        self.func = func
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: Dict = {}
+        self.error: Optional[str] = None
+        self.future = Future()
+        self.on_update: Optional[Callable] = None
+
+    def set_progress(self, **progress):
+        """Called from the job function as work advances"""
+        self.progress = progress
+        self._notify()
+
+    def _notify(self):
+        if self.on_update:
+            try:
+                self.on_update(self)
+            except Exception as e:
+                logger.error(f"Job {self.id} update hook failed: {e}")
+
+    def to_dict(self) -> dict:
+        def iso(ts):
+            return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+        return {
+            "job_id": self.id,
+            "key": self.key,
+            "description": self.description,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": iso(self.created_at),
+            "started_at": iso(self.started_at),
+            "finished_at": iso(self.finished_at)
+        }
+
+
+class JobQueue:
+    """Deduplicating, capacity-limited job queue served by runner threads"""
+
+    def __init__(self, concurrency: int, max_pending: int, cooldown_seconds: int):
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.cooldown_seconds = cooldown_seconds
+
+        self._pending = deque()
+        self._active: Dict[str, Job] = {}        # key -> queued or running job
+        self._last_finished: Dict[str, Job] = {}  # key -> most recent finished job
+        self._history = OrderedDict()           # job_id -> job
+        self._cond = threading.Condition()
+        self._runners = []
+        self.on_update: Optional[Callable] = None
+        self._stats = {
+            "submitted": 0,
+            "deduplicated": 0,
+            "rejected_cooldown": 0,
+            "rejected_full": 0,
+            "completed": 0,
+            "failed": 0
+        }
+
+    def _ensure_runners(self):
+        while len(self._runners) < self.concurrency:
+            runner = threading.Thread(target=self._run, daemon=True)
+            runner.start()
+            self._runners.append(runner)
+
+    def submit(self, key: str, func: Callable, description: str = "",
+               respect_cooldown: bool = True) -> Tuple[Job, bool]:
+        """
+        Queue func(job) under key; returns (job, created)
+
+        created is False when an identical job was already queued or running.
+        Raises JobRejected during the key's cooldown or when the backlog is full.
+        """
+        with self._cond:
+            existing = self._active.get(key)
+            if existing is not None:
+                self._stats["deduplicated"] += 1
+                return existing, False
+
+            last = self._last_finished.get(key)
+            if respect_cooldown and last is not None and self.cooldown_seconds > 0:
+                remaining = self.cooldown_seconds - (time.time() - last.finished_at)
+                if remaining > 0:
+                    self._stats["rejected_cooldown"] += 1
+                    raise JobRejected(
+                        "cooldown",
+                        f"{key} was refreshed recently; retry in {int(remaining) + 1}s",
+                        retry_after=int(remaining) + 1,
+                        last_job=last
+                    )
+
+            if len(self._pending) >= self.max_pending:
+                self._stats["rejected_full"] += 1
+                raise JobRejected("queue_full", "Refresh queue is full; retry later", retry_after=30)
+
+            job = Job(key, func, description)
+            job.on_update = self.on_update
+            self._active[key] = job
+            self._history[job.id] = job
+            while len(self._history) > JOB_HISTORY_SIZE:
+                self._history.popitem(last=False)
+            self._pending.append(job)
+            self._stats["submitted"] += 1
+            self._ensure_runners()
+            self._cond.notify()
+        job._notify()
+        return job, True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                job = self._pending.popleft()
+                job.status = "running"
+                job.started_at = time.time()
+            job._notify()
+
+            logger.info(f"▶️ Job {job.id} started: {job.description}")
+            result, error = None, None
+            try:
+                result = job.func(job)
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}")
+                error = e
+
+            # Release the key before waking waiters so they can resubmit
+            with self._cond:
+                job.func = None
+                job.status = "failed" if error else "completed"
+                job.error = str(error) if error else None
+                job.finished_at = time.time()
+                self._active.pop(job.key, None)
+                self._last_finished[job.key] = job
+                self._stats[job.status] += 1
+            job._notify()
+            if error:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+            logger.info(f"⏹️ Job {job.id} {job.status} in {job.finished_at - job.started_at:.2f}s")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._history.get(job_id)
+
+    def list_jobs(self, limit: int = 50):
+        """Most recent jobs first (limit clamped to 1..JOB_HISTORY_SIZE)"""
+        limit = max(1, min(limit, JOB_HISTORY_SIZE))
+        with self._cond:
+            jobs = list(self._history.values())[-limit:]
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "concurrency": self.concurrency,
+                "max_pending": self.max_pending,
+                "cooldown_seconds": self.cooldown_seconds,
+                "pending": len(self._pending),
+                "running": len(self._active) - len(self._pending),
+                **self._stats
+            }
+
+
+job_queue = JobQueue(
+    concurrency=JOB_CONCURRENCY,
+    max_pending=JOB_MAX_PENDING,
+    cooldown_seconds=REFRESH_COOLDOWN_SECONDS
+)
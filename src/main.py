@@ -6,30 +6,51 @@ Features:
 - Instant API responses from pre-fetched cache
 - Persistent storage across restarts
 - Auto-refresh mechanism
+- Run modes: "all" (API + scraper), "api" (read-only), "worker" (see worker.py)
 """
 
-from fastapi import FastAPI, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 from datetime import datetime
 import os
+import re
+import sys
 import time
-import csv
+import asyncio
 import logging
 import json
-from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import secrets
 import threading
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+
+# Allow sibling imports under both `python src/main.py` and `uvicorn src.main:app`
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Selenium only loads in scrape pool processes; APScheduler only when the worker starts
+import worker
+from catalog import CATEGORIES, CATEGORY_NAMES, CATEGORY_SLUGS, DEFAULT_GEOS, KNOWN_GEOS
+from cluster import cluster
+from jobs import JOB_HISTORY_SIZE, JobRejected, job_queue, new_job_id
+from negative_cache import negative_cache
+from profiling import ADMIN_TOKEN, ProfilingMiddleware, profiler
+from related_graph import GLOBAL_SCOPE, related_graph
+from scrape_pool import ScrapeWorkerError, pool_stats, scrape_category
+from snapshot_bundle import BUNDLE_VERSION, SEED_FROM, BundleError, iter_bundle, seed_cache
+from snapshot_cache import SnapshotCache
+from snapshot_store import (
+    get_cache_file,
+    get_cache_key,
+    list_saved_jobs,
+    list_snapshot_files,
+    load_from_disk,
+    load_job,
+    load_status,
+    request_refresh,
+    save_job,
+    save_to_disk
+)
 
 # Configure logging
 logging.basicConfig(
@@ -38,9 +59,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Storage configuration
-CACHE_DIR = Path("cache_data")
-CACHE_DIR.mkdir(exist_ok=True)
+# Process role: "all" (API + scraper), "api" (read-only API), "worker" (scraper only)
+RUN_MODE = os.getenv("RUN_MODE", "all").lower()
+SNAPSHOT_SYNC_SECONDS = int(os.getenv("SNAPSHOT_SYNC_SECONDS", 5))
+NEGATIVE_RECHECK_POLL_SECONDS = int(os.getenv("NEGATIVE_RECHECK_POLL_SECONDS", 30))
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{12}$")
+
+# Start tracemalloc at boot so cache allocations are attributed in memory snapshots
+PROFILE_TRACEMALLOC = os.getenv("PROFILE_TRACEMALLOC", "false").lower() == "true"
+if PROFILE_TRACEMALLOC:
+    profiler.start_tracemalloc()
 
 # Initialize FastAPI
 app = FastAPI(
@@ -60,246 +88,111 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory cache with metadata
-cache = {}
-cache_lock = threading.Lock()
-REFRESH_INTERVAL_MINUTES = 30  # Background refresh every 30 minutes
-
-# Supported geographies for background fetching
-DEFAULT_GEOS = ["IN", "US", "GB", "AU", "CA"]  # Add more as needed
-
-# Background scheduler
-scheduler = BackgroundScheduler()
-fetch_status = {
-    "last_fetch": None,
-    "next_fetch": None,
-    "status": "initializing",
-    "fetched_geos": []
-}
-
-# Categories mapping
-CATEGORIES = {
-    "all": 0,
-    "autos": 1,
-    "beauty": 2,
-    "business": 3,
-    "entertainment": 4,
-    "food": 5,
-    "games": 6,
-    "health": 7,
-    "hobbies": 8,
-    "education": 9,
-    "law": 10,
-    "other": 11,
-    "pets": 13,
-    "politics": 14,
-    "science": 15,
-    "shopping": 16,
-    "sports": 17,
-    "technology": 18,
-    "travel": 19,
-    "climate": 20
-}
-
-CATEGORY_NAMES = {
-    0: "All Categories",
-    1: "Autos and vehicles",
-    2: "Beauty and fashion",
-    3: "Business and finance",
-    4: "Entertainment",
-    5: "Food and drink",
-    6: "Games",
-    7: "Health",
-    8: "Hobbies and leisure",
-    9: "Jobs and education",
-    10: "Law and government",
-    11: "Other",
-    13: "Pets and animals",
-    14: "Politics",
-    15: "Science",
-    16: "Shopping",
-    17: "Sports",
-    18: "Technology",
-    19: "Travel and transportation",
-    20: "Climate"
-}
-
-
-def get_cache_key(geo: str, category: Optional[str] = None):
-    """Generate cache key"""
-    if category:
-        return f"{geo}_{category}"
-    return f"{geo}_all"
-
-
-def get_cache_file(geo: str, category: Optional[str] = None):
-    """Get cache file path"""
-    cache_key = get_cache_key(geo, category)
-    return CACHE_DIR / f"{cache_key}.json"
+# On-demand profiling (pass-through unless armed via /admin/profile)
+app.add_middleware(ProfilingMiddleware)
 
+# Cache bounds (non-pinned keys expire after CACHE_TTL seconds)
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 500))
+CACHE_TTL = int(os.getenv("CACHE_TTL", 3600))
 
-def load_from_disk(geo: str, category: Optional[str] = None):
-    """Load cached data from disk"""
-    cache_file = get_cache_file(geo, category)
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"Loaded from disk: {cache_file.name}")
-                return data
-        except Exception as e:
-            logger.error(f"Error loading cache from disk: {e}")
-    return None
 
+PINNED_KEYS = {get_cache_key(geo) for geo in DEFAULT_GEOS}
+
+
+def is_pinned_key(cache_key: str) -> bool:
+    """Snapshots of background-fetched geos are never evicted (their category keys are)"""
+    return cache_key in PINNED_KEYS
 
-def save_to_disk(geo: str, data: dict, category: Optional[str] = None):
-    """Save data to disk"""
-    cache_file = get_cache_file(geo, category)
-    try:
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        logger.info(f"Saved to disk: {cache_file.name}")
-    except Exception as e:
-        logger.error(f"Error saving to disk: {e}")
+
+# In-memory cache with byte accounting and LRU/TTL eviction
+def on_cache_evict(cache_key: str):
+    """Keep the related graph in step with the snapshots the cache still holds"""
+    if cache_key.endswith("_all"):
+        related_graph.remove(cache_key)
+
+
+cache = SnapshotCache(
+    max_bytes=CACHE_MAX_BYTES,
+    max_entries=CACHE_MAX_ENTRIES,
+    ttl_seconds=CACHE_TTL,
+    is_pinned=is_pinned_key,
+    on_evict=on_cache_evict
+)
+
+# Disk mtimes of loaded snapshots (API role reloads files that change)
+snapshot_mtimes: Dict[str, float] = {}
+background_stop_event = threading.Event()
+
+def validate_geo(geo: str) -> str:
+    """Normalize a geo code and reject unknown ones before any scrape or disk write"""
+    geo = geo.upper()
+    if geo not in KNOWN_GEOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid geo '{geo}'. Use /geos to see available options."
+        )
+    return geo
 
 
 def get_from_cache(cache_key: str):
-    """Get data from in-memory cache (always fresh due to background updates)"""
-    with cache_lock:
-        if cache_key in cache:
-            data = cache[cache_key]
-            logger.info(f"Cache HIT: {cache_key}")
-            return data
-    return None
-
-
-def set_cache(cache_key: str, data):
-    """Store data in in-memory cache"""
-    with cache_lock:
-        cache[cache_key] = data
-        logger.info(f"Cache SET: {cache_key}")
+    """Get data from in-memory cache (pinned geos are kept fresh by background updates)"""
+    data = cache.get(cache_key)
+    if data is not None:
+        logger.info(f"Cache HIT: {cache_key}")
+    return data
 
 
-def fetch_all_trends_for_geo(geo: str, workers: int = 1):
-    """
-    Fetch all trends for a geography (used by background task)
-    Note: Sequential processing (workers=1) for maximum stability
-    """
-    logger.info(f"🔄 Background fetch started for {geo}")
-    start_time = time.time()
-    
-    all_trends = []
-    successful = 0
-    failed = 0
-    empty = 0
-    
-    # Process categories sequentially to avoid Chrome crashes
-    for category_id, category_name in CATEGORY_NAMES.items():
-        try:
-            # Add delay between categories
-            if successful > 0 or failed > 0:
-                time.sleep(1)  # Cooldown between categories
-            
-            url = f"https://trends.google.com/trending?geo={geo}&category={category_id}"
-            logger.info(f"  Fetching: {category_name}")
-            data = scrape_google_trends(url, category_name, category_id)
-            
-            if data:
-                successful += 1
-                # Add category to each trend
-                for trend in data:
-                    all_trends.append({
-                        "category": category_name,
-                        "category_id": category_id,
-                        **trend
-                    })
-                logger.info(f"  ✓ {category_name}: {len(data)} trends")
-            else:
-                empty += 1
-                logger.info(f"  ○ {category_name}: No data")
-        except Exception as e:
-            failed += 1
-            logger.error(f"  ✗ {category_name}: {e}")
-    
-    execution_time = time.time() - start_time
-    
-    response = {
-        "geo": geo,
-        "total_categories": len(CATEGORY_NAMES),
-        "successful_categories": successful,
-        "failed_categories": failed,
-        "empty_categories": empty,
-        "total_trends": len(all_trends),
-        "trends": all_trends,
-        "timestamp": datetime.now().isoformat(),
-        "execution_time": round(execution_time, 2),
-        "cached": True,
-        "background_fetched": True
-    }
-    
-    # Store in cache
-    cache_key = get_cache_key(geo)
-    set_cache(cache_key, response)
-    
-    # Save to disk
-    save_to_disk(geo, response)
-    
-    logger.info(f"✅ Background fetch completed for {geo}: {len(all_trends)} trends in {execution_time:.2f}s")
-    return response
+def set_cache(cache_key: str, data, stored_at: Optional[float] = None):
+    """Store data in in-memory cache and fold geo snapshots into the related graph"""
+    if cache.set(cache_key, data, stored_at=stored_at):
+        logger.info(f"Cache SET: {cache_key}")
+        if cache_key.endswith("_all"):
+            related_graph.update(cache_key, data)
+    else:
+        logger.warning(f"Cache SET skipped (evicted or oversize): {cache_key}")
+    clear_negative_results(cache_key, data)
 
 
-def background_fetch_task():
-    """
-    Background task to fetch data for all configured geographies
-    """
-    logger.info("🚀 Starting background fetch task for all geographies")
-    fetch_status["status"] = "running"
-    fetch_status["last_fetch"] = datetime.now().isoformat()
-    fetch_status["fetched_geos"] = []  # Reset list
-    
-    for geo in DEFAULT_GEOS:
-        try:
-            # Use 1 worker (sequential) for maximum stability
-            fetch_all_trends_for_geo(geo, workers=1)
-            fetch_status["fetched_geos"].append({
-                "geo": geo,
-                "timestamp": datetime.now().isoformat(),
-                "status": "success"
-            })
-            # Add delay between geographies
-            time.sleep(3)
-        except Exception as e:
-            logger.error(f"Error fetching {geo}: {e}")
-            fetch_status["fetched_geos"].append({
-                "geo": geo,
-                "timestamp": datetime.now().isoformat(),
-                "status": "error",
-                "error": str(e)
-            })
-    
-    fetch_status["status"] = "completed"
-    fetch_status["next_fetch"] = datetime.fromtimestamp(
-        time.time() + (REFRESH_INTERVAL_MINUTES * 60)
-    ).isoformat()
-    
-    logger.info(f"✅ Background fetch completed for all geographies")
+def clear_negative_results(cache_key: str, data):
+    """Positive data for a key (or a category inside a geo snapshot) ends its remembered miss"""
+    trends = data.get("trends") if isinstance(data, dict) else None
+    if not trends:
+        return
+    negative_cache.discard(cache_key)
+    if cache_key.endswith("_all"):
+        geo = data.get("geo", cache_key[:-len("_all")])
+        for category_id in {trend.get("category_id") for trend in trends}:
+            slug = CATEGORY_SLUGS.get(category_id)
+            if slug and slug != "all":
+                negative_cache.discard(get_cache_key(geo, slug))
 
 
 def load_initial_cache():
     """
     Load cached data from disk on startup
+    Pinned geos load first so the byte budget never pushes them out
     """
     logger.info("📂 Loading cached data from disk...")
     loaded_count = 0
     
-    for cache_file in CACHE_DIR.glob("*.json"):
+    cache_files = sorted(
+        list_snapshot_files(),
+        key=lambda p: (not is_pinned_key(p.stem), -p.stat().st_mtime)
+    )
+    for cache_file in cache_files:
         try:
             with open(cache_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 # Extract geo from filename (e.g., "IN_all.json" -> "IN_all")
                 cache_key = cache_file.stem
-                with cache_lock:
-                    cache[cache_key] = data
+                # Keep the file age so TTL expiry survives restarts
+                mtime = cache_file.stat().st_mtime
+                snapshot_mtimes[cache_key] = mtime
+                if not cache.set(cache_key, data, stored_at=mtime):
+                    continue
+                if cache_key.endswith("_all"):
+                    related_graph.update(cache_key, data)
                 loaded_count += 1
                 logger.info(f"  Loaded: {cache_file.name}")
         except Exception as e:
@@ -309,37 +202,190 @@ def load_initial_cache():
     return loaded_count
 
 
+def sync_snapshots():
+    """
+    Reload snapshots the scraper worker has rewritten since we last looked
+    (API role only; in "all" mode the worker publishes to memory directly)
+    """
+    for cache_file in list_snapshot_files():
+        cache_key = cache_file.stem
+        try:
+            mtime = cache_file.stat().st_mtime
+            if snapshot_mtimes.get(cache_key) == mtime:
+                continue
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            snapshot_mtimes[cache_key] = mtime
+            set_cache(cache_key, data, stored_at=mtime)
+        except Exception as e:
+            logger.error(f"  Error syncing {cache_file.name}: {e}")
+
+
+def raise_negative_result(entry):
+    """Answer a remembered miss instantly with its reason code (503 for failed scrapes)"""
+    raise HTTPException(
+        status_code=503 if entry.reason == "scrape_failed" else 404,
+        detail={**entry.to_dict(), "cached": True},
+        headers={"Retry-After": str(max(1, int(entry.expires_at - time.time())))}
+    )
+
+
+def snapshot_sync_loop():
+    """Poll the shared disk store for new snapshots"""
+    while not background_stop_event.wait(SNAPSHOT_SYNC_SECONDS):
+        sync_snapshots()
+
+
+def negative_recheck_loop():
+    """Re-run expired negative results in the background, on their backoff schedule"""
+    while not background_stop_event.wait(NEGATIVE_RECHECK_POLL_SECONDS):
+        for entry in negative_cache.due_for_recheck():
+            geo, _, category = entry.key.partition("_")
+            try:
+                if category == "all":
+                    job, _ = submit_geo_fetch(geo)
+                else:
+                    job, _ = job_queue.submit(
+                        entry.key,
+                        lambda job, geo=geo, category=category: fetch_category(geo, category),
+                        description=f"Recheck {CATEGORY_NAMES[CATEGORIES[category]]} for {geo}"
+                    )
+                job.future.add_done_callback(lambda _, entry=entry: negative_cache.recheck_done(entry))
+                logger.info(f"🔁 Rechecking {entry.key} ({entry.reason}, miss #{entry.misses})")
+            except JobRejected:
+                negative_cache.recheck_done(entry)  # Try again next poll
+
+
+def get_fetch_status() -> dict:
+    """Fetch status from the in-process worker, or as published by a separate one"""
+    if RUN_MODE == "api":
+        return load_status() or {
+            "last_fetch": None,
+            "next_fetch": None,
+            "status": "waiting_for_worker",
+            "fetched_geos": []
+        }
+    return worker.fetch_status
+
+
+def fetch_category(geo: str, category: str):
+    """
+    Live single-category fetch (job body); caches and returns the response
+    
+    An empty or failed scrape is remembered in the negative cache and None is returned.
+    """
+    category_id = CATEGORIES[category]
+    category_name = CATEGORY_NAMES[category_id]
+    cache_key = get_cache_key(geo, category)
+    
+    # Scrape in an isolated scrape worker process
+    url = f"https://trends.google.com/trending?geo={geo}&category={category_id}"
+    try:
+        data = scrape_category(url, category_name, category_id)
+    except ScrapeWorkerError as e:
+        logger.error(f"Error scraping {category_name}: {e}")
+        negative_cache.record(cache_key, "scrape_failed", f"Scraping {category_name} for {geo} failed: {e}")
+        return None
+    if not data:
+        negative_cache.record(cache_key, "empty", f"No trends found for category '{category}' in {geo}.")
+        return None
+    
+    response = {
+        "geo": geo,
+        "category": category_name,
+        "category_id": category_id,
+        "category_slug": category,
+        "total_trends": len(data),
+        "trends": data,
+        "timestamp": datetime.now().isoformat(),
+        "cached": False
+    }
+    
+    # Cache response
+    set_cache(get_cache_key(geo, category), response)
+    save_to_disk(geo, response, category)
+    
+    logger.info(f"Found {len(data)} trends for {category} in {geo}")
+    return response
+
+
+def record_geo_outcome(geo: str, future):
+    """Remember a live geo refresh that produced no trends at all"""
+    snapshot = None if future.exception() else future.result()
+    if snapshot and snapshot.get("total_trends"):
+        return
+    if snapshot and not snapshot.get("failed_categories"):
+        negative_cache.record(get_cache_key(geo), "no_trends", f"No trends found for {geo} in any category.")
+    else:
+        negative_cache.record(get_cache_key(geo), "scrape_failed", f"Refreshing {geo} produced no trends.")
+
+
+def submit_geo_fetch(geo: str):
+    """Queue a live geo refresh whose outcome feeds the negative cache"""
+    job, created = worker.submit_geo_refresh(geo)
+    if created:
+        job.future.add_done_callback(lambda future: record_geo_outcome(geo, future))
+    return job, created
+
+
+def raise_job_rejected(e: JobRejected):
+    """Translate a queue rejection into 429 (cooldown) or 503 (queue full)"""
+    detail = {"message": str(e), "reason": e.reason}
+    if e.last_job is not None:
+        detail["last_job"] = e.last_job.to_dict()
+    raise HTTPException(
+        status_code=429 if e.reason == "cooldown" else 503,
+        detail=detail,
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoints are hidden unless ADMIN_TOKEN is set, and need it in X-Admin-Token"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def queue_refresh_unavailable(geo: str, detail: str):
+    """API role cannot scrape: ask the worker for the geo and tell the client to retry"""
+    request_refresh(geo)
+    raise HTTPException(
+        status_code=503,
+        detail=f"{detail} A refresh has been queued; retry shortly.",
+        headers={"Retry-After": str(SNAPSHOT_SYNC_SECONDS + worker.REQUEST_POLL_SECONDS)}
+    )
+
+
 @app.on_event("startup")
 async def startup_event():
     """
-    Initialize background scheduler and load cache on startup
+    Load cache on startup and start the role-specific background work
     """
-    logger.info("🚀 Starting Google Trends API v2.0.0")
+    logger.info(f"🚀 Starting Google Trends API v2.0.0 (mode: {RUN_MODE})")
+    
+    # Bootstrap from a peer or bundle file; local snapshots that are newer are kept
+    if SEED_FROM:
+        try:
+            await asyncio.to_thread(seed_cache, SEED_FROM)
+        except (BundleError, OSError) as e:
+            logger.error(f"❌ Seeding from {SEED_FROM} failed, starting from local data: {e}")
     
     # Load existing cache from disk
     load_initial_cache()
     
-    # Start background fetch immediately if cache is empty
-    if len(cache) == 0:
-        logger.info("📥 No cache found, starting initial fetch...")
-        threading.Thread(target=background_fetch_task, daemon=True).start()
-    
-    # Schedule periodic background fetches
-    scheduler.add_job(
-        background_fetch_task,
-        trigger=IntervalTrigger(minutes=REFRESH_INTERVAL_MINUTES),
-        id='fetch_trends',
-        name='Fetch Google Trends',
-        replace_existing=True
-    )
-    scheduler.start()
-    
-    fetch_status["status"] = "scheduled"
-    fetch_status["next_fetch"] = datetime.fromtimestamp(
-        time.time() + (REFRESH_INTERVAL_MINUTES * 60)
-    ).isoformat()
-    
-    logger.info(f"✅ Background scheduler started (refresh every {REFRESH_INTERVAL_MINUTES} minutes)")
+    if RUN_MODE == "api":
+        # Follow cluster membership without owning shards (this role never scrapes)
+        cluster.start(join=False)
+        
+        # Read-only: follow snapshots written by the scraper worker
+        threading.Thread(target=snapshot_sync_loop, daemon=True).start()
+        logger.info(f"✅ Following snapshot store (sync every {SNAPSHOT_SYNC_SECONDS}s)")
+    else:
+        # Initial scrape covers only geos whose snapshots are missing or stale
+        worker.start(on_snapshot=set_cache)
+        threading.Thread(target=negative_recheck_loop, daemon=True).start()
 
 
 @app.on_event("shutdown")
@@ -348,144 +394,10 @@ async def shutdown_event():
     Cleanup on shutdown
     """
     logger.info("🛑 Shutting down Google Trends API")
-    scheduler.shutdown()
-    logger.info("✅ Scheduler stopped")
-
-
-def scrape_google_trends(url: str, category_name: str, category_id: int, download_dir="temp_downloads") -> Optional[List[Dict]]:
-    """
-    Scrape Google Trends and return structured data
-    """
-    os.makedirs(download_dir, exist_ok=True)
-
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--remote-debugging-port=9222")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--disable-software-rasterizer")
-    
-    # Set Chrome binary location
-    chrome_bin = os.environ.get('CHROME_BIN', '/usr/bin/chromium')
-    if os.path.exists(chrome_bin):
-        chrome_options.binary_location = chrome_bin
-
-    prefs = {
-        "download.default_directory": os.path.abspath(download_dir),
-        "download.prompt_for_download": False,
-        "safebrowsing.enabled": True
-    }
-    chrome_options.add_experimental_option("prefs", prefs)
-
-    try:
-        # Use system ChromeDriver (installed in Docker) instead of webdriver-manager
-        # This fixes the "Exec format error" bug in Railway deployment
-        chromedriver_path = os.environ.get('CHROMEDRIVER_PATH', '/usr/bin/chromedriver')
-        
-        # Verify chromedriver exists
-        if not os.path.exists(chromedriver_path):
-            logger.error(f"ChromeDriver not found at {chromedriver_path}")
-            # Try alternative path
-            chromedriver_path = '/usr/bin/chromium-driver'
-            if not os.path.exists(chromedriver_path):
-                raise Exception(f"ChromeDriver not found at {chromedriver_path}")
-        
-        logger.info(f"Using ChromeDriver at: {chromedriver_path}")
-        service = ChromeService(executable_path=chromedriver_path)
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        driver.execute_cdp_cmd("Page.setDownloadBehavior", {
-            "behavior": "allow",
-            "downloadPath": os.path.abspath(download_dir)
-        })
-
-        existing_files = set(os.listdir(download_dir))
-        driver.get(url)
-        logger.info(f"Navigated to {url}")
-
-        wait = WebDriverWait(driver, 30)
-        time.sleep(5)  # Increased wait for page load
-        
-        logger.info(f"Page title: {driver.title}")
-        
-        # Try to find Export button with better error handling
-        try:
-            export_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Export')]")))
-            logger.info("Export button found")
-            export_btn.click()
-        except Exception as e:
-            logger.error(f"Export button not found: {e}")
-            # Save page source for debugging
-            page_source = driver.page_source
-            logger.error(f"Page source length: {len(page_source)}")
-            logger.error(f"Page preview: {page_source[:500]}")
-            raise
-
-        time.sleep(3)  # Increased wait
-        csv_element = driver.find_element(By.XPATH, "//span[contains(text(), 'Download CSV')]")
-        logger.info("CSV option found")
-        
-        if csv_element:
-            try:
-                parent = csv_element.find_element(By.XPATH, "./ancestor::button | ./ancestor::div[@role='menuitem'] | ./ancestor::*[@role='option']")
-                driver.execute_script("arguments[0].click();", parent)
-            except:
-                driver.execute_script("arguments[0].click();", csv_element)
-
-        download_path = os.path.abspath(download_dir)
-        max_wait = 40
-        start_time = time.time()
-        downloaded_file = None
-        
-        while time.time() - start_time < max_wait:
-            current_files = set(os.listdir(download_path))
-            new_files = current_files - existing_files
-            csv_files = [f for f in new_files if f.endswith('.csv')]
-            
-            if csv_files:
-                downloaded_file = os.path.join(download_path, csv_files[0])
-                time.sleep(1)
-                break
-            time.sleep(1)
-        
-        driver.quit()
-        
-        if not downloaded_file or not os.path.exists(downloaded_file):
-            logger.warning(f"No data found for {category_name}")
-            return None
-        
-        # Read CSV and convert to dict
-        data = []
-        with open(downloaded_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                data.append({
-                    "trends": row.get("Trends", ""),
-                    "search_volume": row.get("Search volume", ""),
-                    "started": row.get("Started", ""),
-                    "ended": row.get("Ended", ""),
-                    "trend_breakdown": row.get("Trend breakdown", ""),
-                    "explore_link": row.get("Explore link", "")
-                })
-        
-        # Clean up
-        try:
-            os.remove(downloaded_file)
-        except:
-            pass
-        
-        logger.info(f"Successfully scraped {len(data)} trends from {category_name}")
-        return data if data else None
-        
-    except Exception as e:
-        logger.error(f"Error scraping {category_name}: {e}")
-        try:
-            driver.quit()
-        except:
-            pass
-        return None
+    cluster.stop()
+    background_stop_event.set()
+    if RUN_MODE != "api":
+        worker.stop()
 
 
 @app.get("/")
@@ -505,9 +417,14 @@ async def root():
         "endpoints": {
             "GET /api/v1/{geo}": "Get all trends for a geography (instant response)",
             "GET /api/v1/{geo}/{category}": "Get trends for specific category",
+            "GET /api/v1/{geo}/related?q=...": "Related queries ranked by co-occurrence",
             "GET /categories": "List all available categories",
+            "GET /geos": "List supported geography codes",
             "GET /status": "Background fetch status",
             "POST /refresh/{geo}": "Manually trigger refresh for a geography",
+            "GET /jobs/{job_id}": "Progress of a refresh job",
+            "GET /cluster": "Cluster members and owned shards",
+            "GET /snapshots/bundle": "Compressed bundle of all snapshots (replica bootstrap)",
             "GET /health": "Health check",
             "GET /docs": "API documentation"
         },
@@ -515,6 +432,7 @@ async def root():
             "/api/v1/IN - All trends for India",
             "/api/v1/US/technology - Technology trends in USA",
             "/api/v1/GB/sports - Sports trends in UK",
+            "/api/v1/US/related?q=nba - Queries trending together with 'nba' in USA",
             "/status - Check background fetch status"
         ]
     }
@@ -523,9 +441,11 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
+    fetch_status = get_fetch_status()
     health_data = {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
+        "run_mode": RUN_MODE,
         "cache_size": len(cache),
         "uptime": "operational",
         "background_fetch": {
@@ -535,6 +455,10 @@ async def health_check():
         }
     }
     
+    # API-only processes never scrape, so Chrome is not required
+    if RUN_MODE == "api":
+        return health_data
+    
     # Check ChromeDriver availability
     chromedriver_path = os.environ.get('CHROMEDRIVER_PATH', '/usr/bin/chromedriver')
     chromedriver_exists = os.path.exists(chromedriver_path)
@@ -560,13 +484,75 @@ async def health_check():
 async def fetch_status_endpoint():
     """Get background fetch status"""
     return {
-        "refresh_interval_minutes": REFRESH_INTERVAL_MINUTES,
+        "run_mode": RUN_MODE,
+        "refresh_interval_minutes": worker.REFRESH_INTERVAL_MINUTES,
         "supported_geos": DEFAULT_GEOS,
-        "fetch_status": fetch_status,
+        "fetch_status": get_fetch_status(),
         "cache": {
             "in_memory_count": len(cache),
-            "disk_files": len(list(CACHE_DIR.glob("*.json")))
+            "disk_files": len(list_snapshot_files()),
+            **cache.stats()
+        },
+        "cluster": {
+            "enabled": cluster.enabled,
+            "members": len(cluster.members),
+            "membership_version": cluster.version
+        },
+        "negative_cache": negative_cache.stats(),
+        "jobs": job_queue.stats(),
+        "related_graph": related_graph.stats(),
+        "scrape_pool": pool_stats()
+    }
+
+
+@app.get("/cluster")
+async def cluster_status():
+    """Cluster membership and the shards this node owns"""
+    return cluster.describe()
+
+
+@app.get("/cluster/snapshot/{geo}")
+async def cluster_snapshot(geo: str):
+    """
+    This node's current snapshot for a geo, for peers
+    
+    Answered from memory or disk only; never triggers a scrape.
+    """
+    geo = validate_geo(geo)
+    cache_key = get_cache_key(geo)
+    data = get_from_cache(cache_key) or load_from_disk(geo)
+    if not data:
+        raise HTTPException(status_code=404, detail=f"No snapshot for {geo} on this node")
+    return JSONResponse(content=data)
+
+
+@app.get("/snapshots/bundle")
+async def export_snapshot_bundle():
+    """
+    Stream every snapshot on disk as a gzip-compressed, versioned bundle
+    
+    Used by new replicas to seed themselves (SEED_FROM); checksummed per
+    snapshot and as a whole.
+    """
+    files = list_snapshot_files()
+    return StreamingResponse(
+        iter_bundle(files),
+        media_type="application/gzip",
+        headers={
+            "Content-Disposition": f'attachment; filename="snapshots-v{BUNDLE_VERSION}.jsonl.gz"',
+            "X-Bundle-Version": str(BUNDLE_VERSION),
+            "X-Snapshot-Count": str(len(files))
         }
+    )
+
+
+@app.get("/geos")
+async def list_geos():
+    """List geography codes accepted by the API"""
+    return {
+        "total": len(KNOWN_GEOS),
+        "background_fetched": DEFAULT_GEOS,
+        "geos": sorted(KNOWN_GEOS)
     }
 
 
@@ -600,27 +586,66 @@ async def get_all_trends(
     
     Returns instant cached data if available, otherwise fetches live
     """
-    geo = geo.upper()
+    geo = validate_geo(geo)
     
-    # Check cache first (should always hit if background fetch is working)
     cache_key = get_cache_key(geo)
+    
+    # Recently came back with nothing: answer without scraping again
+    negative = negative_cache.get(cache_key)
+    if negative is not None:
+        raise_negative_result(negative)
+    
+    # Check cache first (should always hit if background fetch is working)
     cached_data = get_from_cache(cache_key)
     
     if cached_data:
         logger.info(f"✅ Instant response from cache: {geo}")
         return JSONResponse(content=cached_data)
     
-    # Fallback: check disk cache
-    disk_data = load_from_disk(geo)
+    # Fallback: check disk cache (non-pinned geos are not refreshed in background)
+    max_age = None if is_pinned_key(cache_key) else CACHE_TTL
+    disk_data = load_from_disk(geo, max_age=max_age)
     if disk_data:
         logger.info(f"✅ Response from disk cache: {geo}")
-        set_cache(cache_key, disk_data)
+        # Keep the file's age so it expires on the same schedule as on disk
+        try:
+            stored_at = get_cache_file(geo).stat().st_mtime
+        except OSError:
+            stored_at = None
+        set_cache(cache_key, disk_data, stored_at=stored_at)
         return JSONResponse(content=disk_data)
     
+    # Another node may already hold this geo: serve its snapshot instead of scraping
+    if cluster.enabled:
+        peer_data = await asyncio.to_thread(cluster.fetch_any_peer_snapshot, geo)
+        if peer_data:
+            logger.info(f"✅ Response from peer {peer_data['served_by_peer']}: {geo}")
+            set_cache(cache_key, peer_data)
+            return JSONResponse(content=peer_data)
+    
+    if RUN_MODE == "api":
+        queue_refresh_unavailable(geo, f"No snapshot for {geo} yet.")
+    
     # Last resort: fetch live (only happens if background fetch failed or first time)
+    # Concurrent misses for the same geo share one queued job
     logger.warning(f"⚠️ Cache miss for {geo}, fetching live data...")
     
-    response = fetch_all_trends_for_geo(geo, workers=1)
+    try:
+        job, _ = submit_geo_fetch(geo)
+    except JobRejected as e:
+        raise_job_rejected(e)
+    
+    try:
+        response = await asyncio.wrap_future(job.future)
+    except Exception:
+        response = None
+    if not response or not response.get("total_trends"):
+        # The refresh recorded its outcome before waking us
+        negative = negative_cache.get(cache_key)
+        if negative is not None:
+            raise_negative_result(negative)
+    if response is None:
+        raise HTTPException(status_code=500, detail=f"Refreshing {geo} failed")
     return JSONResponse(content=response)
 
 
@@ -634,23 +659,110 @@ async def manual_refresh(geo: str):
     
     Use this to force an immediate update instead of waiting for background task
     """
-    geo = geo.upper()
+    geo = validate_geo(geo)
     logger.info(f"🔄 Manual refresh triggered for {geo}")
     
-    # Run fetch in background thread to not block response
-    def fetch_and_notify():
-        try:
-            # Use 1 worker (sequential) for stability
-            fetch_all_trends_for_geo(geo, workers=1)
-        except Exception as e:
-            logger.error(f"Error in manual refresh: {e}")
+    if RUN_MODE == "api":
+        # Hand the refresh to the scraper worker via the shared store; it
+        # publishes the job's progress under this id
+        job_id = new_job_id()
+        job = {
+            "job_id": job_id,
+            "key": get_cache_key(geo),
+            "description": f"Refresh all categories for {geo}",
+            "status": "requested",
+            "progress": {},
+            "error": None,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None
+        }
+        save_job(job_id, job)
+        request_refresh(geo, job_id)
+        return {
+            "message": f"Refresh queued for {geo}",
+            "status": "queued",
+            "job_id": job_id,
+            "job": job,
+            "note": f"The scraper worker will pick this up shortly. Check /jobs/{job_id} for progress."
+        }
     
-    threading.Thread(target=fetch_and_notify, daemon=True).start()
+    # Queue the fetch (deduplicated, capped and rate-limited per geo)
+    try:
+        job, created = worker.submit_geo_refresh(geo)
+    except JobRejected as e:
+        raise_job_rejected(e)
     
     return {
-        "message": f"Refresh started for {geo}",
+        "message": f"Refresh {'started' if created else 'already in progress'} for {geo}",
         "status": "processing",
-        "note": "Data will be updated in background. Check /status for progress."
+        "job_id": job.id,
+        "job": job.to_dict(),
+        "deduplicated": not created,
+        "note": f"Data will be updated in background. Check /jobs/{job.id} for progress."
+    }
+
+
+@app.get("/jobs")
+async def list_jobs(limit: int = 50):
+    """Recent refresh jobs (most recent first) and queue counters"""
+    if RUN_MODE == "api":
+        # Jobs run in the scraper worker, which publishes them to the shared store
+        limit = max(1, min(limit, JOB_HISTORY_SIZE))
+        jobs = [job for job in list_saved_jobs(2 * limit) if "worker_job_id" not in job]
+        return {"queue": None, "jobs": jobs[:limit]}
+    return {
+        "queue": job_queue.stats(),
+        "jobs": job_queue.list_jobs(limit)
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status and progress of one refresh job"""
+    job = job_queue.get(job_id)
+    if job is not None:
+        return job.to_dict()
+    # Published by a scraper worker (API-only replicas, or ids handed out by one)
+    record = load_job(job_id) if JOB_ID_PATTERN.match(job_id) else None
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    return record
+
+
+@app.get("/api/v1/{geo}/related")
+async def get_related_trends(geo: str, q: str, limit: int = 10, scope: str = "geo"):
+    """
+    Get queries related to a trend, ranked by co-occurrence
+    
+    Parameters:
+    - geo: Country code (IN, US, GB, etc.)
+    - q: Query or trend title (case-insensitive)
+    - limit: Number of neighbors to return (1-100, default: 10)
+    - scope: "geo" (this geography) or "global" (all geographies)
+    
+    Answered from the prebuilt graph of trend breakdowns
+    """
+    geo = validate_geo(geo)
+    if scope not in ("geo", "global"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid scope '{scope}'. Use 'geo' or 'global'."
+        )
+    limit = max(1, min(limit, 100))
+    
+    result = related_graph.related(geo if scope == "geo" else GLOBAL_SCOPE, q, limit)
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No related trends found for '{q}' in {geo if scope == 'geo' else 'any geography'}."
+        )
+    
+    return {
+        "geo": geo,
+        "scope": scope,
+        **result,
+        "timestamp": datetime.now().isoformat()
     }
 
 
@@ -665,7 +777,7 @@ async def get_category_trends(geo: str, category: str):
     
     Filters from cached data if available for instant response
     """
-    geo = geo.upper()
+    geo = validate_geo(geo)
     category = category.lower()
     
     # Validate category
@@ -681,6 +793,10 @@ async def get_category_trends(geo: str, category: str):
     # Try to get from full cached data first (much faster)
     cache_key_all = get_cache_key(geo)
     cached_all_data = get_from_cache(cache_key_all)
+    if not cached_all_data and category == "all":
+        # "All categories" only lives in the geo snapshot, and a category-level
+        # fetch would share its "{geo}_all" key: go through the geo path instead
+        cached_all_data = json.loads((await get_all_trends(geo)).body)
     
     if cached_all_data and "trends" in cached_all_data:
         # Filter trends by category from cached data
@@ -691,6 +807,8 @@ async def get_category_trends(geo: str, category: str):
         
         if filtered_trends:
             logger.info(f"✅ Filtered {len(filtered_trends)} trends for {category} from cache")
+            # Categories are published independently; report this one's freshness
+            freshness = cached_all_data.get("category_freshness", {}).get(category_name, {})
             response = {
                 "geo": geo,
                 "category": category_name,
@@ -698,11 +816,33 @@ async def get_category_trends(geo: str, category: str):
                 "category_slug": category,
                 "total_trends": len(filtered_trends),
                 "trends": filtered_trends,
-                "timestamp": cached_all_data.get("timestamp", datetime.now().isoformat()),
+                "timestamp": freshness.get("updated_at") or cached_all_data.get("timestamp", datetime.now().isoformat()),
+                "snapshot_version": cached_all_data.get("version"),
                 "cached": True,
                 "filtered_from_cache": True
             }
             return JSONResponse(content=response)
+        
+        # The latest refresh found this category empty: answer from the snapshot
+        # (every role, including API replicas that never fill the negative cache)
+        freshness = cached_all_data.get("category_freshness", {}).get(category_name, {})
+        if freshness.get("status") == "empty":
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "reason": "empty",
+                    "message": f"No trends found for category '{category}' in {geo}.",
+                    "checked_at": freshness.get("updated_at"),
+                    "snapshot_version": cached_all_data.get("version"),
+                    "cached": True
+                }
+            )
+    
+    if category == "all":
+        raise HTTPException(
+            status_code=404,
+            detail=f"No trends found for category '{category}' in {geo}."
+        )
     
     # Fallback: check if we have category-specific cache
     cache_key = get_cache_key(geo, category)
@@ -712,47 +852,159 @@ async def get_category_trends(geo: str, category: str):
         logger.info(f"✅ Category-specific cache hit: {category}")
         return JSONResponse(content=cached_data)
     
-    # Last resort: fetch live
+    # Recently came back empty or failed: answer without scraping again
+    negative = negative_cache.get(cache_key)
+    if negative is not None:
+        raise_negative_result(negative)
+    
+    # Owned by another node: use its snapshot instead of scraping again
+    owner = cluster.owner(geo, category_id)
+    if not cluster.owns(geo, category_id):
+        peer_data = await asyncio.to_thread(cluster.fetch_peer_snapshot, owner, geo)
+        peer_trends = [
+            trend for trend in (peer_data or {}).get("trends", [])
+            if trend.get("category_id") == category_id
+        ]
+        if peer_trends:
+            logger.info(f"✅ {category} for {geo} served from owner {owner}")
+            freshness = peer_data.get("category_freshness", {}).get(category_name, {})
+            return JSONResponse(content={
+                "geo": geo,
+                "category": category_name,
+                "category_id": category_id,
+                "category_slug": category,
+                "total_trends": len(peer_trends),
+                "trends": peer_trends,
+                "timestamp": freshness.get("updated_at") or peer_data.get("timestamp"),
+                "cached": True,
+                "served_by_peer": owner
+            })
+    
+    if RUN_MODE == "api":
+        queue_refresh_unavailable(geo, f"No cached data for {category} in {geo}.")
+    
+    # Last resort: fetch live (one shared job per geo/category)
     logger.warning(f"⚠️ No cached data for {category} in {geo}, fetching live...")
     
-    url = f"https://trends.google.com/trending?geo={geo}&category={category_id}"
-    data = scrape_google_trends(url, category_name, category_id)
+    try:
+        job, _ = job_queue.submit(
+            cache_key,
+            lambda job: fetch_category(geo, category),
+            description=f"Fetch {category_name} for {geo}"
+        )
+        response = await asyncio.wrap_future(job.future)
+    except JobRejected as e:
+        # Fetched moments ago but evicted from memory: serve the saved copy
+        disk_data = load_from_disk(geo, category) if e.reason == "cooldown" else None
+        if not disk_data:
+            raise_job_rejected(e)
+        try:
+            stored_at = get_cache_file(geo, category).stat().st_mtime
+        except OSError:
+            stored_at = None
+        set_cache(cache_key, disk_data, stored_at=stored_at)
+        return JSONResponse(content=disk_data)
     
-    if data is None:
+    if response is None:
+        negative = negative_cache.get(cache_key)
+        if negative is not None:
+            raise_negative_result(negative)
         raise HTTPException(
             status_code=404,
             detail=f"No trends found for category '{category}' in {geo}. Category might be empty."
         )
     
-    response = {
-        "geo": geo,
-        "category": category_name,
-        "category_id": category_id,
-        "category_slug": category,
-        "total_trends": len(data),
-        "trends": data,
-        "timestamp": datetime.now().isoformat(),
-        "cached": False
-    }
-    
-    # Cache response
-    set_cache(cache_key, response)
-    save_to_disk(geo, response, category)
-    
-    logger.info(f"Found {len(data)} trends for {category} in {geo}")
     return JSONResponse(content=response)
 
 
 @app.delete("/cache")
 async def clear_cache():
     """Clear all cached data (admin endpoint)"""
-    with cache_lock:
-        count = len(cache)
-        cache.clear()
+    count = cache.clear()
+    related_graph.clear()
+    negative_cache.clear()
     logger.info(f"Cache cleared: {count} entries removed")
     return {"message": f"Cache cleared ({count} entries removed)"}
 
 
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def profile_status():
+    """Armed captures and downloadable profile files"""
+    return {
+        "armed": profiler.describe(),
+        "files": profiler.list_files()
+    }
+
+
+@app.post("/admin/profile/requests", dependencies=[Depends(require_admin)])
+async def profile_requests(route: str, count: int = 20):
+    """
+    Capture a cProfile of the next requests to a route
+    
+    Parameters:
+    - route: Route template, e.g. /api/v1/{geo} or /api/v1/{geo}/{category}
+    - count: Number of requests to profile (1-1000, default: 20)
+    """
+    routes = {getattr(r, "path", None) for r in app.router.routes}
+    if route not in routes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown route '{route}'. Use a path template such as /api/v1/{{geo}}."
+        )
+    count = max(1, min(count, 1000))
+    return {"message": f"Profiling next {count} requests to {route}", "capture": profiler.arm_requests(route, count)}
+
+
+@app.post("/admin/profile/refresh", dependencies=[Depends(require_admin)])
+async def profile_refresh(geo: Optional[str] = None):
+    """
+    Capture a cProfile of the next geo refresh (any geo, or only `geo`)
+    
+    Scrapes run in pool processes, so this covers orchestration, merging
+    and publishing in the refreshing process.
+    """
+    if RUN_MODE == "api":
+        raise HTTPException(
+            status_code=400,
+            detail="Refreshes run in the scraper worker process, not in this API process."
+        )
+    if geo:
+        geo = validate_geo(geo)
+    return {"message": "Next refresh will be profiled", "capture": profiler.arm_refresh(geo)}
+
+
+@app.post("/admin/profile/memory/start", dependencies=[Depends(require_admin)])
+async def profile_memory_start(frames: int = 25):
+    """Start tracemalloc (only allocations made from now on are traced)"""
+    started = profiler.start_tracemalloc(max(1, min(frames, 100)))
+    return {"tracing": True, "started": started}
+
+
+@app.post("/admin/profile/memory/snapshot", dependencies=[Depends(require_admin)])
+async def profile_memory_snapshot(limit: int = 25):
+    """Dump a tracemalloc snapshot alongside the cache's own byte accounting"""
+    try:
+        result = profiler.memory_snapshot(max(1, min(limit, 200)))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"cache": cache.stats(), **result}
+
+
+@app.post("/admin/profile/memory/stop", dependencies=[Depends(require_admin)])
+async def profile_memory_stop():
+    """Stop tracemalloc and drop its traces"""
+    return {"tracing": False, "stopped": profiler.stop_tracemalloc()}
+
+
+@app.get("/admin/profile/files/{name}", dependencies=[Depends(require_admin)])
+async def download_profile(name: str):
+    """Download a .prof (pstats) or .tracemalloc file"""
+    path = profiler.file_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile file '{name}'")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
@@ -0,0 +1,155 @@
+"""
+Negative-result cache for lookups that came back with nothing
+- Remembers empty and failed (geo, category) scrapes with a reason code
+- Each reason has its own TTL; consecutive misses back off exponentially
+- Expired entries that are still being asked for are handed out for a
+  background recheck; positive data for a key clears its entry
+
+Reason codes:
+- "empty": the scrape ran but Google Trends had no rows
+- "scrape_failed": the scrape worker timed out or died
+- "no_trends": a full geo refresh produced no trends in any category
+"""
+
+from typing import Dict, List, Optional
+from datetime import datetime
+import os
+import time
+import threading
+
+NEGATIVE_TTL_EMPTY = int(os.getenv("NEGATIVE_TTL_EMPTY", 900))
+NEGATIVE_TTL_FAILED = int(os.getenv("NEGATIVE_TTL_FAILED", 120))
+NEGATIVE_TTL_MAX = int(os.getenv("NEGATIVE_TTL_MAX", 6 * 3600))  # Backoff cap; idle entries are dropped after this
+NEGATIVE_MAX_ENTRIES = 1000
+
+REASON_TTLS = {
+    "empty": NEGATIVE_TTL_EMPTY,
+    "no_trends": NEGATIVE_TTL_EMPTY,
+    "scrape_failed": NEGATIVE_TTL_FAILED
+}
+
+
+class NegativeEntry:
+    """One remembered miss and its backoff state"""
+
+    __slots__ = ("key", "reason", "detail", "misses", "first_seen", "checked_at",
+                 "expires_at", "last_hit", "rechecking")
+
+    def __init__(self, key: str, reason: str, detail: str, misses: int, first_seen: float, now: float):
+        self.key = key
+        self.reason = reason
+        self.detail = detail
+        self.misses = misses
+        self.first_seen = first_seen
+        self.checked_at = now
+        self.expires_at = now + min(REASON_TTLS.get(reason, NEGATIVE_TTL_FAILED) * 2 ** (misses - 1), NEGATIVE_TTL_MAX)
+        self.last_hit = now
+        self.rechecking = False
+
+    def to_dict(self) -> dict:
+        return {
+            "reason": self.reason,
+            "message": self.detail,
+            "consecutive_misses": self.misses,
+            "first_seen": datetime.fromtimestamp(self.first_seen).isoformat(),
+            "checked_at": datetime.fromtimestamp(self.checked_at).isoformat(),
+            "next_check_at": datetime.fromtimestamp(self.expires_at).isoformat()
+        }
+
+
+class NegativeCache:
+    """Thread-safe map of cache key -> NegativeEntry"""
+
+    def __init__(self, max_entries: int = NEGATIVE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: Dict[str, NegativeEntry] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "recorded": 0, "cleared": 0, "rechecks": 0, "dropped_idle": 0}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: str) -> Optional[NegativeEntry]:
+        """
+        The remembered miss for key, if any
+
+        Past its TTL the entry keeps answering until the background
+        recheck replaces or clears it, so misses never wait on a scrape.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_hit = time.time()
+                self._stats["hits"] += 1
+            return entry
+
+    def record(self, key: str, reason: str, detail: str) -> NegativeEntry:
+        """Remember a miss; repeating the same reason doubles the TTL"""
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous.reason == reason:
+                entry = NegativeEntry(key, reason, detail, previous.misses + 1, previous.first_seen, now)
+                entry.last_hit = previous.last_hit
+            else:
+                entry = NegativeEntry(key, reason, detail, 1, now, now)
+            self._entries[key] = entry
+            self._stats["recorded"] += 1
+            if len(self._entries) > self.max_entries:
+                oldest = min(self._entries.values(), key=lambda e: e.last_hit)
+                del self._entries[oldest.key]
+            return entry
+
+    def discard(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats["cleared"] += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    def due_for_recheck(self) -> List[NegativeEntry]:
+        """
+        Expired entries to recheck now (each marked so it is handed out once)
+
+        Entries nobody asked for within NEGATIVE_TTL_MAX are dropped instead.
+        """
+        now = time.time()
+        due = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.rechecking or entry.expires_at > now:
+                    continue
+                if now - entry.last_hit > NEGATIVE_TTL_MAX:
+                    del self._entries[key]
+                    self._stats["dropped_idle"] += 1
+                    continue
+                entry.rechecking = True
+                due.append(entry)
+            self._stats["rechecks"] += len(due)
+        return due
+
+    def recheck_done(self, entry: NegativeEntry):
+        """Make an entry eligible again if its recheck recorded nothing new"""
+        with self._lock:
+            entry.rechecking = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            reasons: Dict[str, int] = {}
+            for entry in self._entries.values():
+                reasons[entry.reason] = reasons.get(entry.reason, 0) + 1
+            return {
+                "entries": len(self._entries),
+                "by_reason": reasons,
+                "ttl_seconds": dict(REASON_TTLS),
+                "max_ttl_seconds": NEGATIVE_TTL_MAX,
+                **self._stats
+            }
+
+
+negative_cache = NegativeCache()
@@ -0,0 +1,231 @@
+"""
+On-demand profiling hooks (admin only, enabled by ADMIN_TOKEN)
+- cProfile capture of the next N requests to one route
+- One-shot cProfile of the next geo refresh
+- tracemalloc snapshots (e.g. of what the cache is holding)
+
+Results are written to PROFILE_DIR as standard files: *.prof (load with
+pstats / snakeviz) and *.tracemalloc (tracemalloc.Snapshot.load).
+When nothing is armed the request hook is a single attribute check.
+"""
+
+from pathlib import Path
+from typing import Callable, Optional
+from datetime import datetime
+import os
+import re
+import cProfile
+import logging
+import threading
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")  # Profiling endpoints are disabled when unset
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "profiles"))
+MAX_PROFILE_FILES = int(os.getenv("MAX_PROFILE_FILES", 20))
+PROFILE_FILE_PATTERN = re.compile(r"^[\w.-]+\.(prof|tracemalloc)$")
+
+
+def route_template(scope) -> Optional[str]:
+    """Path template of the route that will serve this request (e.g. /api/v1/{geo})"""
+    from starlette.routing import Match
+
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", None)
+    return None
+
+
+class Profiler:
+    """Holds armed captures; only one cProfile session runs at a time"""
+
+    def __init__(self):
+        self.request_capture: Optional[dict] = None
+        self.refresh_capture: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+
+    def _save(self, profile: cProfile.Profile, prefix: str) -> str:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        name = f"{prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.prof"
+        profile.dump_stats(PROFILE_DIR / name)
+        self._prune()
+        logger.info(f"📈 Profile saved: {name}")
+        return name
+
+    def _prune(self):
+        files = sorted(
+            (f for f in PROFILE_DIR.glob("*.*") if PROFILE_FILE_PATTERN.match(f.name)),
+            key=lambda p: p.stat().st_mtime
+        )
+        for old in files[:-MAX_PROFILE_FILES]:
+            old.unlink(missing_ok=True)
+
+    # Request profiling
+
+    def arm_requests(self, route: str, count: int) -> dict:
+        with self._lock:
+            self.request_capture = {
+                "route": route,
+                "total": count,
+                "remaining": count,
+                "profile": cProfile.Profile(),
+                "armed_at": datetime.now().isoformat()
+            }
+        logger.info(f"📈 Profiling next {count} requests to {route}")
+        return self.describe()["requests"]
+
+    async def profile_request(self, app, scope, receive, send):
+        """
+        Run one request under the armed profile if it targets the armed route
+
+        The event loop is shared, so the profile also includes any other
+        request work that interleaves with this one.
+        """
+        capture = self.request_capture
+        if capture is None or route_template(scope) != capture["route"] or not self._busy.acquire(blocking=False):
+            return await app(scope, receive, send)
+        try:
+            capture["profile"].enable()
+            try:
+                await app(scope, receive, send)
+            finally:
+                capture["profile"].disable()
+        finally:
+            self._busy.release()
+
+        with self._lock:
+            capture["remaining"] -= 1
+            done = capture["remaining"] <= 0 and self.request_capture is capture
+            if done:
+                self.request_capture = None
+        if done:
+            slug = re.sub(r"[^\w]+", "_", capture["route"]).strip("_") or "root"
+            capture["file"] = self._save(capture["profile"], f"requests-{slug}")
+
+    # Refresh profiling
+
+    def arm_refresh(self, geo: Optional[str] = None) -> dict:
+        with self._lock:
+            self.refresh_capture = {"geo": geo, "armed_at": datetime.now().isoformat()}
+        logger.info(f"📈 Profiling next refresh{f' of {geo}' if geo else ''}")
+        return self.refresh_capture
+
+    def run_refresh(self, geo: str, func: Callable, *args, **kwargs):
+        """Call func, under cProfile if a refresh capture is armed for this geo"""
+        if self.refresh_capture is None:
+            return func(*args, **kwargs)
+        with self._lock:
+            capture = self.refresh_capture
+            if capture is None or capture["geo"] not in (None, geo):
+                capture = None
+            elif self._busy.acquire(blocking=False):
+                self.refresh_capture = None
+            else:
+                capture = None
+        if capture is None:
+            return func(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            self._busy.release()
+            self._save(profile, f"refresh-{geo}")
+
+    # Memory snapshots
+
+    def start_tracemalloc(self, frames: int = 25) -> bool:
+        if tracemalloc.is_tracing():
+            return False
+        tracemalloc.start(frames)
+        logger.info(f"📈 tracemalloc started ({frames} frames)")
+        return True
+
+    def stop_tracemalloc(self) -> bool:
+        if not tracemalloc.is_tracing():
+            return False
+        tracemalloc.stop()
+        logger.info("📈 tracemalloc stopped")
+        return True
+
+    def memory_snapshot(self, limit: int = 25) -> dict:
+        """Dump a tracemalloc snapshot and summarize the top allocation sites"""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running; start it first")
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>")
+        ])
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        name = f"memory-{datetime.now().strftime('%Y%m%d-%H%M%S')}.tracemalloc"
+        snapshot.dump(str(PROFILE_DIR / name))
+        self._prune()
+
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "file": name,
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "top": [
+                {
+                    "location": str(stat.traceback[0]),
+                    "size_bytes": stat.size,
+                    "count": stat.count
+                }
+                for stat in snapshot.statistics("lineno")[:limit]
+            ]
+        }
+
+    # Listing / download
+
+    def list_files(self):
+        if not PROFILE_DIR.exists():
+            return []
+        files = sorted(PROFILE_DIR.glob("*.*"), key=lambda p: p.stat().st_mtime, reverse=True)
+        return [
+            {
+                "name": f.name,
+                "size_bytes": f.stat().st_size,
+                "created": datetime.fromtimestamp(f.stat().st_mtime).isoformat()
+            }
+            for f in files if PROFILE_FILE_PATTERN.match(f.name)
+        ]
+
+    def file_path(self, name: str) -> Optional[Path]:
+        """Resolve a downloadable profile file, rejecting anything outside PROFILE_DIR"""
+        if not PROFILE_FILE_PATTERN.match(name):
+            return None
+        path = PROFILE_DIR / name
+        return path if path.is_file() else None
+
+    def describe(self) -> dict:
+        capture = self.request_capture
+        return {
+            "requests": {
+                "route": capture["route"],
+                "total": capture["total"],
+                "remaining": capture["remaining"],
+                "armed_at": capture["armed_at"]
+            } if capture else None,
+            "refresh": self.refresh_capture,
+            "tracemalloc": tracemalloc.is_tracing()
+        }
+
+
+profiler = Profiler()
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware: a no-op pass-through unless a request capture is armed"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if profiler.request_capture is None or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        return await profiler.profile_request(self.app, scope, receive, send)
@@ -0,0 +1,215 @@
+"""
+Geo refresh orchestration
+Walks every category for a geo, scraping each one through the scrape
+pool. Each finished category is merged into the geo's snapshot and
+published right away (memory + disk), so fresh categories never wait
+behind slow ones and a crash mid-run keeps everything gathered so far.
+In a cluster, categories owned by other nodes are copied from their
+snapshots instead of being scraped (or scraped here when the owner
+can't supply them). Imports no Selenium itself.
+"""
+
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+import time
+import logging
+
+from catalog import CATEGORY_NAMES
+from cluster import cluster
+from scrape_pool import scrape_category
+from snapshot_store import get_cache_key, load_from_disk, save_to_disk
+
+logger = logging.getLogger(__name__)
+
+
+def build_snapshot(geo: str, trends_by_category: Dict[int, List[Dict]], freshness: Dict[str, Dict],
+                   version: int, counters: Dict, started_at: float, completed: int) -> dict:
+    """Assemble a new immutable snapshot (readers never see a half-merged dict)"""
+    all_trends = [
+        trend
+        for category_id in CATEGORY_NAMES
+        for trend in trends_by_category.get(category_id, [])
+    ]
+    return {
+        "geo": geo,
+        "version": version,
+        "total_categories": len(CATEGORY_NAMES),
+        "successful_categories": counters["successful"],
+        "failed_categories": counters["failed"],
+        "empty_categories": counters["empty"],
+        "peer_categories": counters["peer"],
+        "peer_unavailable_categories": counters["peer_unavailable"],
+        "total_trends": len(all_trends),
+        "trends": all_trends,
+        "category_freshness": freshness,
+        "refresh_in_progress": completed < len(CATEGORY_NAMES),
+        "refreshed_categories": completed,
+        "refresh_started_at": datetime.fromtimestamp(started_at).isoformat(),
+        "timestamp": datetime.now().isoformat(),
+        "execution_time": round(time.time() - started_at, 2),
+        "cached": True,
+        "background_fetched": True
+    }
+
+
+def fetch_all_trends_for_geo(geo: str, workers: int = 1, on_snapshot: Optional[Callable] = None,
+                             on_progress: Optional[Callable] = None, scrape_unserved: bool = True):
+    """
+    Fetch all trends for a geography (used by background task)
+    Note: Sequential processing (workers=1) for maximum stability
+
+    Every category result is published as a new snapshot version: written
+    to the shared disk store, and passed to on_snapshot(cache_key, data)
+    so an in-process API serves it immediately. Categories not yet
+    refreshed keep their previous trends; failed ones keep their last good
+    data. Categories owned by another cluster node are copied from that
+    node's snapshot at the end of the run; ones the owner can't supply are
+    scraped locally, or with scrape_unserved=False (scheduled runs) keep
+    their previous trends with status "peer_unavailable".
+    on_progress(**counters) is called after every category.
+    """
+    logger.info(f"🔄 Background fetch started for {geo}")
+    start_time = time.time()
+
+    # Start from the current snapshot so untouched categories keep serving
+    previous = load_from_disk(geo) or {}
+    trends_by_category: Dict[int, List[Dict]] = {}
+    for trend in previous.get("trends", []):
+        trends_by_category.setdefault(trend.get("category_id"), []).append(trend)
+    freshness = dict(previous.get("category_freshness", {}))
+    version = previous.get("version", 0)
+    counters = {"successful": 0, "failed": 0, "empty": 0, "peer": 0, "peer_unavailable": 0}
+    snapshot = previous
+    peer_owned: Dict[str, List[int]] = {}
+
+    def publish(completed: int):
+        nonlocal version, snapshot
+        version += 1
+        snapshot = build_snapshot(geo, trends_by_category, dict(freshness), version, counters, start_time, completed)
+        save_to_disk(geo, snapshot)
+        if on_snapshot:
+            on_snapshot(get_cache_key(geo), snapshot)
+
+    def scrape(category_id: int, category_name: str):
+        """Scrape one category and merge the result into the working snapshot"""
+        now = datetime.now().isoformat()
+        try:
+            # Add delay between categories
+            if counters["successful"] > 0 or counters["failed"] > 0:
+                time.sleep(1)  # Cooldown between categories
+
+            url = f"https://trends.google.com/trending?geo={geo}&category={category_id}"
+            logger.info(f"  Fetching: {category_name}")
+            data = scrape_category(url, category_name, category_id)
+
+            if data:
+                counters["successful"] += 1
+                # Add category to each trend
+                trends_by_category[category_id] = [
+                    {
+                        "category": category_name,
+                        "category_id": category_id,
+                        **trend
+                    }
+                    for trend in data
+                ]
+                freshness[category_name] = {
+                    "category_id": category_id,
+                    "status": "success",
+                    "total_trends": len(data),
+                    "updated_at": now
+                }
+                logger.info(f"  ✓ {category_name}: {len(data)} trends")
+            else:
+                counters["empty"] += 1
+                trends_by_category.pop(category_id, None)
+                freshness[category_name] = {
+                    "category_id": category_id,
+                    "status": "empty",
+                    "total_trends": 0,
+                    "updated_at": now
+                }
+                logger.info(f"  ○ {category_name}: No data")
+        except Exception as e:
+            counters["failed"] += 1
+            # Keep serving the last good data for this category
+            entry = dict(freshness.get(category_name, {
+                "category_id": category_id,
+                "total_trends": 0,
+                "updated_at": None
+            }))
+            entry.update(status="failed", failed_at=now, error=str(e))
+            freshness[category_name] = entry
+            logger.error(f"  ✗ {category_name}: {e}")
+
+    # Process categories sequentially to avoid Chrome crashes
+    for index, (category_id, category_name) in enumerate(CATEGORY_NAMES.items(), 1):
+        # Categories owned by another node are copied from its snapshot below
+        if not cluster.owns(geo, category_id):
+            peer_owned.setdefault(cluster.owner(geo, category_id), []).append(category_id)
+            continue
+
+        scrape(category_id, category_name)
+
+        # Publish this category now instead of after the whole geo
+        publish(index)
+
+        if on_progress:
+            on_progress(
+                completed_categories=index,
+                total_categories=len(CATEGORY_NAMES),
+                last_category=category_name,
+                version=version,
+                **counters
+            )
+
+    if peer_owned:
+        # Fill peer-owned categories last so their data is as fresh as possible
+        for node, category_ids in peer_owned.items():
+            peer_snapshot = (cluster.fetch_peer_snapshot(node, geo) if node else None) or {}
+            peer_freshness = peer_snapshot.get("category_freshness", {})
+            for category_id in category_ids:
+                category_name = CATEGORY_NAMES[category_id]
+                status = peer_freshness.get(category_name, {}).get("status")
+                if status in ("success", "empty"):
+                    peer_trends = [
+                        trend for trend in peer_snapshot.get("trends", [])
+                        if trend.get("category_id") == category_id
+                    ]
+                    if peer_trends:
+                        trends_by_category[category_id] = peer_trends
+                    else:
+                        trends_by_category.pop(category_id, None)
+                    freshness[category_name] = {**peer_freshness[category_name], "owner": node}
+                    counters["peer"] += 1
+                elif scrape_unserved:
+                    # Owner down, cold, or not refreshing this geo: don't leave a hole
+                    logger.info(f"  {category_name}: not served by {node}, scraping locally")
+                    scrape(category_id, category_name)
+                else:
+                    # Keep what we had, but don't pass it off as fresh
+                    counters["peer_unavailable"] += 1
+                    entry = dict(freshness.get(category_name, {
+                        "category_id": category_id,
+                        "total_trends": 0,
+                        "updated_at": None
+                    }))
+                    entry.update(status="peer_unavailable", owner=node, checked_at=datetime.now().isoformat())
+                    freshness[category_name] = entry
+                    logger.warning(f"  ? {category_name}: owner {node} has no data for {geo}")
+        publish(len(CATEGORY_NAMES))
+        
+        if on_progress:
+            on_progress(
+                completed_categories=len(CATEGORY_NAMES),
+                total_categories=len(CATEGORY_NAMES),
+                last_category=None,
+                version=version,
+                **counters
+            )
+    
+    logger.info(
+        f"✅ Background fetch completed for {geo}: {snapshot['total_trends']} trends "
+        f"in {time.time() - start_time:.2f}s (v{version})"
+    )
+    return snapshot
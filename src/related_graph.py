@@ -0,0 +1,175 @@
+"""
+Related-trends co-occurrence graph
+- Built from each trend's title plus its comma-separated trend_breakdown
+- Terms that appear in the same trend row are linked; edge weight counts
+  how many rows they share, per geo and across all geos ("global" scope)
+- Maintained incrementally: each (snapshot, category) group is
+  fingerprinted and only changed groups are re-parsed on publish
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "*"
+MAX_TERMS_PER_TREND = 15  # Caps pairs per row at 105
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def parse_terms(trend: dict) -> List[str]:
+    """Distinct normalized terms of one trend row (title first)"""
+    terms = []
+    raw_terms = [trend.get("trends", "")] + (trend.get("trend_breakdown") or "").split(",")
+    for raw in raw_terms:
+        term = normalize_term(raw)
+        if term and term not in terms:
+            terms.append(term)
+            if len(terms) >= MAX_TERMS_PER_TREND:
+                break
+    return terms
+
+
+def _bump(counter: Counter, key, delta: int):
+    counter[key] += delta
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class _Group:
+    """Contribution of one category within one snapshot"""
+
+    def __init__(self, geo: str, category: str, fingerprint: int, rows: List[List[str]]):
+        self.geo = geo
+        self.category = category
+        self.fingerprint = fingerprint
+        self.pairs = Counter()
+        self.terms = Counter()
+        for terms in rows:
+            self.terms.update(terms)
+            for i, a in enumerate(terms):
+                for b in terms[i + 1:]:
+                    self.pairs[(a, b)] += 1
+
+
+class RelatedGraph:
+    """Weighted adjacency of co-occurring trend terms, per geo and global"""
+
+    def __init__(self):
+        self._groups: Dict[Tuple[str, object], _Group] = {}
+        self._adjacency = defaultdict(dict)       # scope -> term -> Counter(neighbor -> weight)
+        self._term_categories = defaultdict(dict)  # scope -> term -> Counter(category -> rows)
+        self._lock = threading.Lock()
+
+    def _apply(self, group: _Group, sign: int):
+        for scope in (group.geo, GLOBAL_SCOPE):
+            adjacency = self._adjacency[scope]
+            for (a, b), weight in group.pairs.items():
+                for src, dst in ((a, b), (b, a)):
+                    neighbors = adjacency.setdefault(src, Counter())
+                    _bump(neighbors, dst, sign * weight)
+                    if not neighbors:
+                        del adjacency[src]
+            categories = self._term_categories[scope]
+            for term, count in group.terms.items():
+                counter = categories.setdefault(term, Counter())
+                _bump(counter, group.category, sign * count)
+                if not counter:
+                    del categories[term]
+            if not adjacency:
+                del self._adjacency[scope]
+            if not categories:
+                del self._term_categories[scope]
+
+    def update(self, snapshot_key: str, snapshot: dict):
+        """Fold a newly published snapshot into the graph"""
+        geo = snapshot.get("geo")
+        if not geo:
+            return
+        rows_by_category = defaultdict(list)
+        names = {}
+        for trend in snapshot.get("trends", []):
+            category_id = trend.get("category_id", snapshot.get("category_id"))
+            rows_by_category[category_id].append(trend)
+            names[category_id] = trend.get("category") or snapshot.get("category") or str(category_id)
+
+        changed = 0
+        with self._lock:
+            seen = set()
+            for category_id, trends in rows_by_category.items():
+                group_key = (snapshot_key, category_id)
+                seen.add(group_key)
+                fingerprint = hash(tuple(
+                    (trend.get("trends", ""), trend.get("trend_breakdown", "")) for trend in trends
+                ))
+                existing = self._groups.get(group_key)
+                if existing is not None and existing.fingerprint == fingerprint:
+                    continue
+                if existing is not None:
+                    self._apply(existing, -1)
+                group = _Group(geo, names[category_id], fingerprint, [parse_terms(t) for t in trends])
+                self._apply(group, 1)
+                self._groups[group_key] = group
+                changed += 1
+
+            # Categories that disappeared from the snapshot (now empty)
+            for group_key in [k for k in self._groups if k[0] == snapshot_key and k not in seen]:
+                self._apply(self._groups.pop(group_key), -1)
+                changed += 1
+
+        if changed:
+            logger.info(f"Related graph updated: {snapshot_key} ({changed} categories)")
+
+    def remove(self, snapshot_key: str):
+        """Drop everything a snapshot contributed (e.g. when the cache evicts it)"""
+        with self._lock:
+            group_keys = [k for k in self._groups if k[0] == snapshot_key]
+            for group_key in group_keys:
+                self._apply(self._groups.pop(group_key), -1)
+        if group_keys:
+            logger.info(f"Related graph: removed {snapshot_key} ({len(group_keys)} categories)")
+
+    def clear(self):
+        with self._lock:
+            self._groups.clear()
+            self._adjacency.clear()
+            self._term_categories.clear()
+
+    def related(self, scope: str, query: str, limit: int = 10) -> Optional[dict]:
+        """Top neighbors of a term by co-occurrence weight, or None if unknown"""
+        term = normalize_term(query)
+        with self._lock:
+            neighbors = self._adjacency.get(scope, {}).get(term)
+            categories = self._term_categories.get(scope, {}).get(term)
+            if neighbors is None and categories is None:
+                return None
+            term_categories = self._term_categories.get(scope, {})
+            return {
+                "query": term,
+                "categories": [name for name, _ in categories.most_common()] if categories else [],
+                "total_neighbors": len(neighbors) if neighbors else 0,
+                "related": [
+                    {
+                        "query": neighbor,
+                        "weight": weight,
+                        "categories": [name for name, _ in term_categories.get(neighbor, Counter()).most_common(3)]
+                    }
+                    for neighbor, weight in (neighbors.most_common(limit) if neighbors else [])
+                ]
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "snapshot_groups": len(self._groups),
+                "terms": {scope: len(terms) for scope, terms in self._term_categories.items()},
+                "edges": sum(len(n) for n in self._adjacency.get(GLOBAL_SCOPE, {}).values()) // 2
+            }
+
+
+related_graph = RelatedGraph()
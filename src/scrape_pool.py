@@ -0,0 +1,278 @@
+"""
+Supervised scrape process pool
+- Each scrape runs in a child process (spawned, never forked from the server)
+- Results come back over a per-worker pipe
+- Workers that exceed SCRAPE_JOB_TIMEOUT or die are killed with their
+  Chrome children and replaced
+
+Keeps Selenium, Chrome I/O and CSV parsing off the API process's GIL.
+"""
+
+from concurrent.futures import Future
+from collections import deque
+from multiprocessing.connection import wait
+from typing import List, Optional, Dict
+import multiprocessing as mp
+import os
+import signal
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_POOL_SIZE = int(os.getenv("SCRAPE_POOL_SIZE", 2))  # 0 = scrape in-process
+SCRAPE_JOB_TIMEOUT = int(os.getenv("SCRAPE_JOB_TIMEOUT", 150))  # Seconds per category scrape
+
+
+class ScrapeWorkerError(Exception):
+    """A scrape failed, timed out or its worker process died"""
+
+
+def _worker_main(conn, download_dir: str):
+    """Child process loop: receive (job_id, args), send back (job_id, ok, payload)"""
+    # Own process group so a kill also takes down chromedriver/Chrome
+    if hasattr(os, "setsid"):
+        os.setsid()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    from scraper import scrape_google_trends
+
+    # Private download dir so parallel workers never pick up each other's CSVs
+    worker_dir = os.path.join(download_dir, f"worker-{os.getpid()}")
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message is None:
+            break
+        job_id, (url, category_name, category_id) = message
+        try:
+            result = scrape_google_trends(url, category_name, category_id, download_dir=worker_dir)
+            conn.send((job_id, True, result))
+        except Exception as e:
+            conn.send((job_id, False, repr(e)))
+
+
+class _WorkerSlot:
+    """One supervised child process and the job it is running"""
+
+    def __init__(self, ctx, download_dir: str):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, download_dir),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.spawned_at = time.time()
+        self.job_id: Optional[int] = None
+        self.started_at = 0.0
+
+    def kill(self):
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (AttributeError, ProcessLookupError, PermissionError):
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ScrapePool:
+    """
+    Fixed-size pool of scrape processes with a supervisor thread
+
+    submit() returns a concurrent.futures.Future; scrape() blocks on it.
+    """
+
+    def __init__(self, size: int, job_timeout: float, download_dir: str = "temp_downloads"):
+        self.size = size
+        self.job_timeout = job_timeout
+        self.download_dir = download_dir
+
+        self._ctx = mp.get_context("spawn")
+        self._slots: List[_WorkerSlot] = []
+        self._pending = deque()  # (job_id, args, future)
+        self._futures: Dict[int, Future] = {}
+        self._next_job_id = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._supervisor = None
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "restarts": 0
+        }
+
+    def start(self):
+        os.makedirs(self.download_dir, exist_ok=True)
+        self._slots = [_WorkerSlot(self._ctx, self.download_dir) for _ in range(self.size)]
+        self._supervisor = threading.Thread(target=self._supervise, daemon=True)
+        self._supervisor.start()
+        logger.info(f"✅ Scrape pool started ({self.size} processes, {self.job_timeout}s timeout)")
+
+    def shutdown(self):
+        self._stop_event.set()
+        if self._supervisor is not None:
+            self._supervisor.join(timeout=5)
+        for slot in self._slots:
+            # A busy worker would only stop after its scrape: kill it outright
+            if slot.job_id is not None:
+                slot.kill()
+                continue
+            try:
+                slot.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            slot.process.join(timeout=2)
+            if slot.process.is_alive():
+                slot.kill()
+        with self._lock:
+            # Fail queued and in-flight jobs so no scrape() waits forever
+            futures = [future for _, _, future in self._pending] + list(self._futures.values())
+            self._pending.clear()
+            self._futures.clear()
+        for future in futures:
+            if not future.done():
+                future.set_exception(ScrapeWorkerError("Scrape pool shut down"))
+        logger.info("✅ Scrape pool stopped")
+
+    def submit(self, url: str, category_name: str, category_id: int) -> Future:
+        future = Future()
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._pending.append((job_id, (url, category_name, category_id), future))
+            self._stats["submitted"] += 1
+        return future
+
+    def scrape(self, url: str, category_name: str, category_id: int) -> Optional[List[Dict]]:
+        """Run one category scrape in a worker process and wait for the result"""
+        return self.submit(url, category_name, category_id).result()
+
+    def _replace(self, index: int, reason: str):
+        """Kill a worker, fail its job and start a fresh process in its place"""
+        slot = self._slots[index]
+        slot.kill()
+        if slot.job_id is not None:
+            future = self._futures.pop(slot.job_id, None)
+            if future is not None:
+                future.set_exception(ScrapeWorkerError(reason))
+            self._stats["failed"] += 1
+        self._slots[index] = _WorkerSlot(self._ctx, self.download_dir)
+        self._stats["restarts"] += 1
+        logger.warning(f"♻️ Scrape worker replaced: {reason}")
+
+    def _supervise(self):
+        while not self._stop_event.is_set():
+            # Collect finished jobs
+            conns = [slot.conn for slot in self._slots if slot.job_id is not None]
+            if conns:
+                ready = wait(conns, timeout=0.2)
+            else:
+                self._stop_event.wait(0.2)
+                ready = []
+            for conn in ready:
+                slot = next(s for s in self._slots if s.conn is conn)
+                try:
+                    job_id, ok, payload = conn.recv()
+                except (EOFError, OSError):
+                    continue  # Dead worker, handled below
+                future = self._futures.pop(job_id, None)
+                slot.job_id = None
+                if future is None:
+                    continue
+                if ok:
+                    self._stats["completed"] += 1
+                    future.set_result(payload)
+                else:
+                    self._stats["failed"] += 1
+                    future.set_exception(ScrapeWorkerError(payload))
+
+            # Kill hung workers and replace dead ones
+            now = time.time()
+            for index, slot in enumerate(self._slots):
+                if slot.job_id is not None and now - slot.started_at > self.job_timeout:
+                    self._stats["timeouts"] += 1
+                    self._replace(index, f"job exceeded {self.job_timeout}s")
+                elif not slot.process.is_alive() and (slot.job_id is not None or now - slot.spawned_at > 1):
+                    # Idle workers that die right after spawning are retried at most once a second
+                    self._replace(index, f"worker exited with code {slot.process.exitcode}")
+
+            # Dispatch pending jobs to idle workers
+            with self._lock:
+                for slot in self._slots:
+                    if not self._pending:
+                        break
+                    if slot.job_id is not None:
+                        continue
+                    job_id, args, future = self._pending.popleft()
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        slot.conn.send((job_id, args))
+                    except (OSError, ValueError):
+                        # Worker died between checks; it is replaced on the next pass
+                        self._stats["failed"] += 1
+                        future.set_exception(ScrapeWorkerError("worker unavailable"))
+                        continue
+                    self._futures[job_id] = future
+                    slot.job_id = job_id
+                    slot.started_at = time.time()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "job_timeout": self.job_timeout,
+                "busy": sum(1 for slot in self._slots if slot.job_id is not None),
+                "pending": len(self._pending),
+                **self._stats
+            }
+
+
+_pool: Optional[ScrapePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_scrape_pool() -> Optional[ScrapePool]:
+    """Process-wide pool, started on first use (None when SCRAPE_POOL_SIZE=0)"""
+    global _pool
+    if SCRAPE_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ScrapePool(SCRAPE_POOL_SIZE, SCRAPE_JOB_TIMEOUT)
+            _pool.start()
+        return _pool
+
+
+def scrape_category(url: str, category_name: str, category_id: int) -> Optional[List[Dict]]:
+    """Scrape one category, isolated in the pool when enabled"""
+    pool = get_scrape_pool()
+    if pool is None:
+        from scraper import scrape_google_trends
+        try:
+            return scrape_google_trends(url, category_name, category_id)
+        except Exception as e:
+            raise ScrapeWorkerError(repr(e)) from e
+    return pool.scrape(url, category_name, category_id)
+
+
+def pool_stats() -> Optional[dict]:
+    """Pool counters for /status (None until the pool has started)"""
+    return _pool.stats() if _pool is not None else None
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,157 @@
+"""
+Google Trends scraper (Selenium)
+Only scrape worker processes import this module, so API processes never
+pay for the Selenium import or need Chrome installed.
+"""
+
+from typing import List, Optional, Dict
+import os
+import time
+import csv
+import logging
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+logger = logging.getLogger(__name__)
+
+
+def scrape_google_trends(url: str, category_name: str, category_id: int, download_dir="temp_downloads") -> Optional[List[Dict]]:
+    """
+    Scrape Google Trends and return structured data
+
+    Returns None when the category has no trends; raises when the scrape
+    itself fails (missing ChromeDriver, no Export button, network errors).
+    """
+    os.makedirs(download_dir, exist_ok=True)
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-software-rasterizer")
+    
+    # Set Chrome binary location
+    chrome_bin = os.environ.get('CHROME_BIN', '/usr/bin/chromium')
+    if os.path.exists(chrome_bin):
+        chrome_options.binary_location = chrome_bin
+
+    prefs = {
+        "download.default_directory": os.path.abspath(download_dir),
+        "download.prompt_for_download": False,
+        "safebrowsing.enabled": True
+    }
+    chrome_options.add_experimental_option("prefs", prefs)
+
+    try:
+        # Use system ChromeDriver (installed in Docker) instead of webdriver-manager
+        # This fixes the "Exec format error" bug in Railway deployment
+        chromedriver_path = os.environ.get('CHROMEDRIVER_PATH', '/usr/bin/chromedriver')
+        
+        # Verify chromedriver exists
+        if not os.path.exists(chromedriver_path):
+            logger.error(f"ChromeDriver not found at {chromedriver_path}")
+            # Try alternative path
+            chromedriver_path = '/usr/bin/chromium-driver'
+            if not os.path.exists(chromedriver_path):
+                raise Exception(f"ChromeDriver not found at {chromedriver_path}")
+        
+        logger.info(f"Using ChromeDriver at: {chromedriver_path}")
+        service = ChromeService(executable_path=chromedriver_path)
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        
+        driver.execute_cdp_cmd("Page.setDownloadBehavior", {
+            "behavior": "allow",
+            "downloadPath": os.path.abspath(download_dir)
+        })
+
+        existing_files = set(os.listdir(download_dir))
+        driver.get(url)
+        logger.info(f"Navigated to {url}")
+
+        wait = WebDriverWait(driver, 30)
+        time.sleep(5)  # Increased wait for page load
+        
+        logger.info(f"Page title: {driver.title}")
+        
+        # Try to find Export button with better error handling
+        try:
+            export_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Export')]")))
+            logger.info("Export button found")
+            export_btn.click()
+        except Exception as e:
+            logger.error(f"Export button not found: {e}")
+            # Save page source for debugging
+            page_source = driver.page_source
+            logger.error(f"Page source length: {len(page_source)}")
+            logger.error(f"Page preview: {page_source[:500]}")
+            raise
+
+        time.sleep(3)  # Increased wait
+        csv_element = driver.find_element(By.XPATH, "//span[contains(text(), 'Download CSV')]")
+        logger.info("CSV option found")
+        
+        if csv_element:
+            try:
+                parent = csv_element.find_element(By.XPATH, "./ancestor::button | ./ancestor::div[@role='menuitem'] | ./ancestor::*[@role='option']")
+                driver.execute_script("arguments[0].click();", parent)
+            except:
+                driver.execute_script("arguments[0].click();", csv_element)
+
+        download_path = os.path.abspath(download_dir)
+        max_wait = 40
+        start_time = time.time()
+        downloaded_file = None
+        
+        while time.time() - start_time < max_wait:
+            current_files = set(os.listdir(download_path))
+            new_files = current_files - existing_files
+            csv_files = [f for f in new_files if f.endswith('.csv')]
+            
+            if csv_files:
+                downloaded_file = os.path.join(download_path, csv_files[0])
+                time.sleep(1)
+                break
+            time.sleep(1)
+        
+        driver.quit()
+        
+        if not downloaded_file or not os.path.exists(downloaded_file):
+            logger.warning(f"No data found for {category_name}")
+            return None
+        
+        # Read CSV and convert to dict
+        data = []
+        with open(downloaded_file, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                data.append({
+                    "trends": row.get("Trends", ""),
+                    "search_volume": row.get("Search volume", ""),
+                    "started": row.get("Started", ""),
+                    "ended": row.get("Ended", ""),
+                    "trend_breakdown": row.get("Trend breakdown", ""),
+                    "explore_link": row.get("Explore link", "")
+                })
+        
+        # Clean up
+        try:
+            os.remove(downloaded_file)
+        except:
+            pass
+        
+        logger.info(f"Successfully scraped {len(data)} trends from {category_name}")
+        return data if data else None
+        
+    except Exception as e:
+        logger.error(f"Error scraping {category_name}: {e}")
+        try:
+            driver.quit()
+        except:
+            pass
+        raise
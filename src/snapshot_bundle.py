@@ -0,0 +1,154 @@
+"""
+Snapshot bundles for bootstrapping a replica from a healthy peer
+- Export: every snapshot on disk as one gzip stream of JSON lines
+  (header, one line per snapshot, trailer), generated file by file
+- Import: verifies format version, per-snapshot sha256 and the trailer's
+  count/digest before writing anything, then keeps whichever copy of each
+  snapshot is newer (bundle or local)
+
+SEED_FROM is a peer base URL (http://host:8000) or a bundle file path.
+"""
+
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+from urllib.request import urlopen
+import os
+import re
+import gzip
+import json
+import time
+import zlib
+import hashlib
+import logging
+
+from catalog import CATEGORIES, KNOWN_GEOS
+from snapshot_store import get_cache_file, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = "google-trends-snapshots"
+BUNDLE_VERSION = 1
+BUNDLE_PATH = "/snapshots/bundle"
+SEED_FROM = os.getenv("SEED_FROM")
+SEED_TIMEOUT_SECONDS = int(os.getenv("SEED_TIMEOUT", 60))
+SNAPSHOT_KEY_PATTERN = re.compile(r"^([A-Z]{2})_([a-z]+)$")
+
+
+class BundleError(Exception):
+    """A bundle is malformed, truncated, of an unknown version or fails its checksums"""
+
+
+def _canonical(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _line(record: dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def iter_bundle(files: Iterable[Path]) -> Iterator[bytes]:
+    """Gzip-compressed bundle chunks, reading one snapshot file at a time"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    bundle_digest = hashlib.sha256()
+    count = 0
+
+    yield compressor.compress(_line({
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "created_at": time.time()
+    }))
+    for path in files:
+        try:
+            stored_at = path.stat().st_mtime
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = _canonical(json.load(f))
+        except Exception as e:
+            logger.error(f"Skipping {path.name} in bundle: {e}")
+            continue
+        digest = hashlib.sha256(payload).hexdigest()
+        bundle_digest.update(digest.encode("ascii"))
+        count += 1
+        # data is spliced in as already-serialized canonical JSON
+        head = _line({"key": path.stem, "stored_at": stored_at, "sha256": digest})[:-2]
+        chunk = compressor.compress(head + b',"data":' + payload + b"}\n")
+        if chunk:
+            yield chunk
+    yield compressor.compress(_line({"end": True, "count": count, "sha256": bundle_digest.hexdigest()}))
+    yield compressor.flush()
+
+
+def read_bundle(fileobj) -> List[Tuple[str, float, dict]]:
+    """Parse and verify a whole bundle; returns (key, stored_at, data) entries"""
+    entries = []
+    bundle_digest = hashlib.sha256()
+    trailer = None
+    try:
+        with gzip.GzipFile(fileobj=fileobj) as stream:
+            header = json.loads(stream.readline() or b"null")
+            if not isinstance(header, dict) or header.get("format") != BUNDLE_FORMAT:
+                raise BundleError("Not a snapshot bundle")
+            if header.get("version") != BUNDLE_VERSION:
+                raise BundleError(f"Unsupported bundle version {header.get('version')} (expected {BUNDLE_VERSION})")
+
+            for raw in stream:
+                record = json.loads(raw)
+                if record.get("end"):
+                    trailer = record
+                    break
+                key = record["key"]
+                match = SNAPSHOT_KEY_PATTERN.match(key)
+                if not match or match.group(1) not in KNOWN_GEOS or match.group(2) not in CATEGORIES:
+                    raise BundleError(f"Invalid snapshot key {key!r}")
+                digest = hashlib.sha256(_canonical(record["data"])).hexdigest()
+                if digest != record["sha256"]:
+                    raise BundleError(f"Checksum mismatch for {key}")
+                bundle_digest.update(digest.encode("ascii"))
+                entries.append((key, float(record["stored_at"]), record["data"]))
+    except BundleError:
+        raise
+    except Exception as e:
+        raise BundleError(f"Unreadable bundle: {e}")
+
+    if trailer is None:
+        raise BundleError("Bundle is truncated (no trailer)")
+    if trailer.get("count") != len(entries) or trailer.get("sha256") != bundle_digest.hexdigest():
+        raise BundleError("Bundle trailer does not match its contents")
+    return entries
+
+
+def import_bundle(fileobj) -> dict:
+    """
+    Verify a bundle, then write each snapshot unless the local copy is newer
+
+    Imported files keep the bundle's stored_at as their mtime, so cache TTLs
+    and staleness checks treat them as exactly as old as they are.
+    """
+    entries = read_bundle(fileobj)
+    stats = {"snapshots": len(entries), "imported": 0, "kept_local": 0}
+    for key, stored_at, data in entries:
+        geo, _, category = key.partition("_")
+        path = get_cache_file(geo, None if category == "all" else category)
+        if path.exists() and path.stat().st_mtime >= stored_at:
+            stats["kept_local"] += 1
+            continue
+        write_json_atomic(path, data)
+        os.utime(path, (stored_at, stored_at))
+        stats["imported"] += 1
+    return stats
+
+
+def seed_cache(source: str) -> dict:
+    """Seed the disk store from a peer URL or a bundle file (raises BundleError/OSError)"""
+    logger.info(f"🌱 Seeding snapshots from {source}")
+    start = time.time()
+    if source.startswith(("http://", "https://")):
+        with urlopen(f"{source.rstrip('/')}{BUNDLE_PATH}", timeout=SEED_TIMEOUT_SECONDS) as response:
+            stats = import_bundle(response)
+    else:
+        with open(source, 'rb') as f:
+            stats = import_bundle(f)
+    logger.info(
+        f"✅ Seeded {stats['imported']} snapshots ({stats['kept_local']} newer locally) "
+        f"in {time.time() - start:.2f}s"
+    )
+    return stats
@@ -0,0 +1,180 @@
+"""
+Size-bounded in-memory snapshot cache
+Features:
+- Per-entry byte accounting (serialized JSON size)
+- LRU eviction when the byte or entry budget is exceeded
+- TTL expiry for non-pinned keys
+- Pinned keys (background-fetched geos) are never evicted
+- Optional on_evict(key) callback for structures derived from entries
+"""
+
+from collections import OrderedDict
+from typing import Callable, List, Optional
+import json
+import threading
+import time
+
+
+def estimate_size(data) -> int:
+    """Approximate memory cost of a cached payload (UTF-8 JSON bytes)"""
+    try:
+        return len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(repr(data).encode("utf-8"))
+
+
+class SnapshotCache:
+    """
+    Thread-safe LRU cache bounded by total bytes and entry count
+
+    Pinned keys count toward the budget but are never evicted, so the
+    background-fetched geos always stay resident. on_evict(key) runs,
+    outside the lock, for every entry dropped by TTL, LRU, pop or a
+    rejected replacement (not for clear()).
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_entries: int,
+        ttl_seconds: int,
+        is_pinned: Optional[Callable[[str], bool]] = None,
+        on_evict: Optional[Callable[[str], None]] = None
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.is_pinned = is_pinned or (lambda key: False)
+        self.on_evict = on_evict
+
+        self._entries = OrderedDict()  # key -> (data, size, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions_lru": 0,
+            "evictions_ttl": 0,
+            "rejected_oversize": 0
+        }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: str):
+        with self._lock:
+            return key in self._entries
+
+    def _expired(self, key: str, stored_at: float, now: float) -> bool:
+        if self.ttl_seconds <= 0 or self.is_pinned(key):
+            return False
+        return now - stored_at > self.ttl_seconds
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _notify(self, keys: List[str]):
+        if self.on_evict:
+            for key in keys:
+                self.on_evict(key)
+
+    def _evict(self) -> List[str]:
+        """Drop expired entries, then least recently used ones, until within budget"""
+        evicted = []
+        now = time.time()
+        for key, (_, _, stored_at) in list(self._entries.items()):
+            if self._expired(key, stored_at, now):
+                self._remove(key)
+                self._stats["evictions_ttl"] += 1
+                evicted.append(key)
+
+        for key in list(self._entries.keys()):
+            if self._bytes <= self.max_bytes and len(self._entries) <= self.max_entries:
+                break
+            if self.is_pinned(key):
+                continue
+            self._remove(key)
+            self._stats["evictions_lru"] += 1
+            evicted.append(key)
+        return evicted
+
+    def get(self, key: str):
+        """Return cached data (refreshing its LRU position) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expired = self._expired(key, entry[2], time.time())
+            if expired:
+                self._remove(key)
+                self._stats["evictions_ttl"] += 1
+                self._stats["misses"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+        if expired:
+            self._notify([key])
+            return None
+        return entry[0]
+
+    def set(self, key: str, data, stored_at: Optional[float] = None) -> bool:
+        """
+        Store data under key; returns False if a non-pinned entry is
+        larger than the whole budget and was not admitted
+        """
+        size = estimate_size(data)
+        with self._lock:
+            replaced = key in self._entries
+            if replaced:
+                self._remove(key)
+            if size > self.max_bytes and not self.is_pinned(key):
+                self._stats["rejected_oversize"] += 1
+                evicted, admitted = [key] if replaced else [], False
+            else:
+                self._entries[key] = (data, size, stored_at or time.time())
+                self._bytes += size
+                self._stats["sets"] += 1
+                evicted = self._evict()
+                admitted = key in self._entries
+        self._notify(evicted)
+        return admitted
+
+    def pop(self, key: str):
+        """Remove a key, returning its data (or None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._remove(key)
+        self._notify([key])
+        return entry[0]
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def clear(self) -> int:
+        """Remove all entries and return how many were dropped"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
+
+    def stats(self) -> dict:
+        """Snapshot of size and eviction counters for /status"""
+        with self._lock:
+            pinned = [key for key in self._entries if self.is_pinned(key)]
+            return {
+                "entries": len(self._entries),
+                "pinned_entries": len(pinned),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                **self._stats
+            }
@@ -0,0 +1,175 @@
+"""
+On-disk snapshot store shared by the API and scraper roles
+- One JSON file per cache key in CACHE_DIR (e.g. IN_all.json)
+- Worker status, job state and refresh requests live in subdirectories
+  so the top-level *.json glob only ever sees snapshots
+"""
+
+from typing import Dict, List, Optional
+import os
+import time
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Storage configuration
+CACHE_DIR = Path(os.getenv("CACHE_DIR", "cache_data"))
+CACHE_DIR.mkdir(exist_ok=True)
+
+STATUS_FILE = CACHE_DIR / "status" / "fetch_status.json"
+REQUESTS_DIR = CACHE_DIR / "requests"
+JOBS_DIR = CACHE_DIR / "status" / "jobs"
+
+
+def get_cache_key(geo: str, category: Optional[str] = None):
+    """Generate cache key"""
+    if category:
+        return f"{geo}_{category}"
+    return f"{geo}_all"
+
+
+def get_cache_file(geo: str, category: Optional[str] = None):
+    """Get cache file path"""
+    cache_key = get_cache_key(geo, category)
+    return CACHE_DIR / f"{cache_key}.json"
+
+
+def write_json_atomic(path: Path, data):
+    """Write JSON via a temp file + rename so readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_from_disk(geo: str, category: Optional[str] = None, max_age: Optional[int] = None):
+    """Load cached data from disk (ignoring files older than max_age seconds)"""
+    cache_file = get_cache_file(geo, category)
+    if cache_file.exists():
+        if max_age is not None and time.time() - cache_file.stat().st_mtime > max_age:
+            logger.info(f"Skipping stale disk cache: {cache_file.name}")
+            return None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                logger.info(f"Loaded from disk: {cache_file.name}")
+                return data
+        except Exception as e:
+            logger.error(f"Error loading cache from disk: {e}")
+    return None
+
+
+def save_to_disk(geo: str, data: dict, category: Optional[str] = None):
+    """Save data to disk"""
+    cache_file = get_cache_file(geo, category)
+    try:
+        write_json_atomic(cache_file, data)
+        logger.info(f"Saved to disk: {cache_file.name}")
+    except Exception as e:
+        logger.error(f"Error saving to disk: {e}")
+
+
+def list_snapshot_files():
+    """All snapshot files currently on disk"""
+    return list(CACHE_DIR.glob("*.json"))
+
+
+def save_status(status: dict):
+    """Publish the scraper's fetch status for API processes"""
+    try:
+        write_json_atomic(STATUS_FILE, status)
+    except Exception as e:
+        logger.error(f"Error saving fetch status: {e}")
+
+
+def load_status() -> Optional[dict]:
+    """Read the fetch status published by the scraper worker"""
+    try:
+        with open(STATUS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Error loading fetch status: {e}")
+        return None
+
+
+def request_refresh(geo: str, request_id: Optional[str] = None):
+    """Ask the scraper worker to refresh a geo (picked up on its next poll)"""
+    REQUESTS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(REQUESTS_DIR / f"{geo}.refresh", 'a', encoding='utf-8') as f:
+        f.write(f"{request_id or ''}\n")
+
+
+def pop_refresh_requests() -> Dict[str, List[str]]:
+    """Consume pending refresh requests: geo -> request ids to report progress under"""
+    if not REQUESTS_DIR.exists():
+        return {}
+    requests = {}
+    for request_file in sorted(REQUESTS_DIR.glob("*.refresh")):
+        # Claim by rename: requests appended afterwards land in a new file
+        claimed = request_file.with_name(f".{request_file.name}.{os.getpid()}.claimed")
+        try:
+            os.replace(request_file, claimed)
+            with open(claimed, 'r', encoding='utf-8') as f:
+                request_ids = [line.strip() for line in f if line.strip()]
+            claimed.unlink()
+        except FileNotFoundError:
+            continue
+        requests[request_file.stem] = request_ids
+    return requests
+
+
+def save_job(job_id: str, record: dict):
+    """Publish a job's state for API processes (GET /jobs/{id})"""
+    try:
+        write_json_atomic(JOBS_DIR / f"{job_id}.json", record)
+    except Exception as e:
+        logger.error(f"Error saving job {job_id}: {e}")
+
+
+def load_job(job_id: str) -> Optional[dict]:
+    """A published job's state (job_id must already be validated)"""
+    try:
+        with open(JOBS_DIR / f"{job_id}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Error loading job {job_id}: {e}")
+        return None
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def list_saved_jobs(limit: int) -> List[dict]:
+    """Published jobs, most recently updated first"""
+    if not JOBS_DIR.exists():
+        return []
+    jobs = []
+    for job_file in sorted(JOBS_DIR.glob("*.json"), key=_mtime, reverse=True):
+        if len(jobs) >= limit:
+            break
+        try:
+            with open(job_file, 'r', encoding='utf-8') as f:
+                jobs.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # Pruned or being replaced
+    return jobs
+
+
+def prune_saved_jobs(keep: int):
+    """Delete all but the `keep` most recently updated job files"""
+    if not JOBS_DIR.exists():
+        return
+    job_files = sorted(JOBS_DIR.glob("*.json"), key=_mtime, reverse=True)
+    for old in job_files[keep:]:
+        old.unlink(missing_ok=True)
@@ -0,0 +1,271 @@
+"""
+Scraper worker role
+- Runs the periodic background fetch for DEFAULT_GEOS
+- Writes snapshots and fetch status to the shared disk store
+- Picks up refresh requests queued by API-only processes and publishes
+  job state so those processes can answer GET /jobs/{id}
+
+Run standalone with `python src/worker.py` (RUN_MODE=worker), or started
+inside the API process when RUN_MODE=all. APScheduler is imported lazily
+and Selenium only ever loads inside scrape pool processes.
+"""
+
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+import os
+import sys
+import time
+import logging
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from catalog import DEFAULT_GEOS
+from jobs import JOB_HISTORY_SIZE, JobRejected, job_queue
+from snapshot_store import (
+    get_cache_key, list_snapshot_files, pop_refresh_requests, prune_saved_jobs, save_job, save_status
+)
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL_MINUTES = int(os.getenv("REFRESH_INTERVAL_MINUTES", 30))  # Background refresh every 30 minutes
+REQUEST_POLL_SECONDS = int(os.getenv("REQUEST_POLL_SECONDS", 5))
+
+# Background scheduler (created on start)
+scheduler = None
+fetch_status = {
+    "last_fetch": None,
+    "next_fetch": None,
+    "status": "initializing",
+    "fetched_geos": []
+}
+
+_on_snapshot: Optional[Callable] = None
+_stop_event = threading.Event()
+
+# Request ids API processes handed out, per worker job id
+_request_ids: Dict[str, List[str]] = {}
+_publish_lock = threading.Lock()
+
+
+def fetch_all_trends_for_geo(geo: str, workers: int = 1, on_progress: Optional[Callable] = None,
+                             scrape_unserved: bool = True):
+    """Scrape one geo and publish it to disk (and memory when in-process)"""
+    from profiling import profiler
+    from refresh import fetch_all_trends_for_geo as refresh_geo
+    return profiler.run_refresh(
+        geo, refresh_geo, geo,
+        workers=workers, on_snapshot=_on_snapshot, on_progress=on_progress,
+        scrape_unserved=scrape_unserved
+    )
+
+
+def submit_geo_refresh(geo: str, respect_cooldown: bool = True, scheduled: bool = False):
+    """
+    Queue a full refresh of a geo; returns (job, created)
+
+    Concurrent requests for the same geo share one job. Raises
+    JobRejected during the geo's cooldown or when the queue is full.
+    Live (non-scheduled) refreshes also scrape peer-owned categories the
+    owner can't supply.
+    """
+    def run(job):
+        # Use 1 worker (sequential) for stability
+        return fetch_all_trends_for_geo(
+            geo, workers=1, on_progress=job.set_progress, scrape_unserved=not scheduled
+        )
+
+    return job_queue.submit(
+        get_cache_key(geo),
+        run,
+        description=f"Refresh all categories for {geo}",
+        respect_cooldown=respect_cooldown
+    )
+
+
+def stale_geos():
+    """DEFAULT_GEOS whose snapshot is missing or older than one refresh interval"""
+    cutoff = time.time() - REFRESH_INTERVAL_MINUTES * 60
+    mtimes = {path.stem: path.stat().st_mtime for path in list_snapshot_files()}
+    return [geo for geo in DEFAULT_GEOS if mtimes.get(get_cache_key(geo), 0) < cutoff]
+
+
+def background_fetch_task(geos: Optional[List[str]] = None):
+    """
+    Background task to fetch data for all configured geographies
+    (or just the given ones)
+    """
+    geos = DEFAULT_GEOS if geos is None else geos
+    logger.info(f"🚀 Starting background fetch task for {', '.join(geos)}")
+    fetch_status["status"] = "running"
+    fetch_status["last_fetch"] = datetime.now().isoformat()
+    fetch_status["fetched_geos"] = []  # Reset list
+    save_status(fetch_status)
+
+    for geo in geos:
+        try:
+            # Scheduled refreshes ignore the manual-refresh cooldown
+            job, _ = submit_geo_refresh(geo, respect_cooldown=False, scheduled=True)
+            job.future.result()
+            fetch_status["fetched_geos"].append({
+                "geo": geo,
+                "timestamp": datetime.now().isoformat(),
+                "status": "success"
+            })
+            save_status(fetch_status)
+            # Add delay between geographies
+            time.sleep(3)
+        except Exception as e:
+            logger.error(f"Error fetching {geo}: {e}")
+            fetch_status["fetched_geos"].append({
+                "geo": geo,
+                "timestamp": datetime.now().isoformat(),
+                "status": "error",
+                "error": str(e)
+            })
+            save_status(fetch_status)
+
+    fetch_status["status"] = "completed"
+    fetch_status["next_fetch"] = datetime.fromtimestamp(
+        time.time() + (REFRESH_INTERVAL_MINUTES * 60)
+    ).isoformat()
+    save_status(fetch_status)
+
+    logger.info(f"✅ Background fetch completed for all geographies")
+
+
+def publish_job(job):
+    """
+    Write a job's state to the shared store, under its own id and under
+    every request id an API process returned for it
+    """
+    with _publish_lock:
+        record = job.to_dict()
+        save_job(job.id, record)
+        for request_id in _request_ids.get(job.id, []):
+            save_job(request_id, {**record, "job_id": request_id, "worker_job_id": job.id})
+        if job.finished_at:
+            _request_ids.pop(job.id, None)
+            prune_saved_jobs(keep=2 * JOB_HISTORY_SIZE)
+
+
+def poll_refresh_requests():
+    """Serve refresh requests queued on disk by API-only processes"""
+    while not _stop_event.wait(REQUEST_POLL_SECONDS):
+        for geo, request_ids in pop_refresh_requests().items():
+            try:
+                job, created = submit_geo_refresh(geo)
+                logger.info(f"🔄 Queued refresh picked up for {geo} (job {job.id}{'' if created else ', deduplicated'})")
+            except JobRejected as e:
+                logger.info(f"Queued refresh for {geo} skipped: {e}")
+                for request_id in request_ids:
+                    save_job(request_id, {
+                        "job_id": request_id,
+                        "key": get_cache_key(geo),
+                        "status": "rejected",
+                        "reason": e.reason,
+                        "error": str(e),
+                        "finished_at": datetime.now().isoformat()
+                    })
+                continue
+            with _publish_lock:
+                _request_ids.setdefault(job.id, []).extend(request_ids)
+            publish_job(job)  # Also covers a job that already finished
+
+
+def start(on_snapshot: Optional[Callable] = None, initial_fetch: Optional[bool] = None):
+    """
+    Start the scheduler (non-blocking)
+
+    on_snapshot(cache_key, data) is called after each snapshot is saved,
+    letting an in-process API update its memory cache directly.
+    initial_fetch defaults to fetching only geos whose snapshots are
+    missing or stale (e.g. after seeding from a peer bundle); True
+    fetches every geo, False none.
+    """
+    global scheduler, _on_snapshot
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    from cluster import cluster
+
+    _on_snapshot = on_snapshot
+    _stop_event.clear()
+    cluster.start()
+    job_queue.on_update = publish_job
+
+    if initial_fetch is None:
+        initial_geos = stale_geos()
+    else:
+        initial_geos = list(DEFAULT_GEOS) if initial_fetch else []
+
+    # Start background fetch immediately for missing or stale geos
+    if initial_geos:
+        logger.info(f"📥 Missing or stale snapshots for {', '.join(initial_geos)}, starting initial fetch...")
+        threading.Thread(target=background_fetch_task, args=(initial_geos,), daemon=True).start()
+
+    # Schedule periodic background fetches
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(
+        background_fetch_task,
+        trigger=IntervalTrigger(minutes=REFRESH_INTERVAL_MINUTES),
+        id='fetch_trends',
+        name='Fetch Google Trends',
+        replace_existing=True
+    )
+    scheduler.start()
+
+    threading.Thread(target=poll_refresh_requests, daemon=True).start()
+
+    fetch_status["status"] = "scheduled"
+    fetch_status["next_fetch"] = datetime.fromtimestamp(
+        time.time() + (REFRESH_INTERVAL_MINUTES * 60)
+    ).isoformat()
+    save_status(fetch_status)
+
+    logger.info(f"✅ Background scheduler started (refresh every {REFRESH_INTERVAL_MINUTES} minutes)")
+
+
+def stop():
+    """Stop the scheduler, the refresh request poller and the scrape pool"""
+    from cluster import cluster
+    from scrape_pool import shutdown_pool
+    _stop_event.set()
+    cluster.stop()
+    if scheduler is not None:
+        scheduler.shutdown()
+    shutdown_pool()
+    logger.info("✅ Scheduler stopped")
+
+
+def main():
+    """Run the scraper worker in the foreground"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger.info("🚀 Starting Google Trends scraper worker")
+    from cluster import NODE_URL, cluster
+    if cluster.enabled and not NODE_URL:
+        # No HTTP server here, so peers could never copy this worker's shards
+        logger.error(
+            "❌ RUN_MODE=worker in a cluster needs CLUSTER_NODE_URL pointing at an API "
+            "replica that shares this worker's CACHE_DIR (it serves /cluster/snapshot/{geo})"
+        )
+        sys.exit(1)
+    from snapshot_bundle import SEED_FROM, BundleError, seed_cache
+    if SEED_FROM:
+        try:
+            seed_cache(SEED_FROM)
+        except (BundleError, OSError) as e:
+            logger.error(f"❌ Seeding from {SEED_FROM} failed, starting from local data: {e}")
+    start()
+    try:
+        while True:
+            time.sleep(1)
+    except (KeyboardInterrupt, SystemExit):
+        stop()
+
+
+if __name__ == "__main__":
+    main()
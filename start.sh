@@ -40,8 +40,15 @@ if [ -f "/.dockerenv" ] || [ -n "$RAILWAY_ENVIRONMENT" ]; then
     # Create temp directory
     mkdir -p temp_downloads
     
+    # Scraper-only role: no HTTP server
+    if [ "$RUN_MODE" = "worker" ]; then
+        echo ""
+        echo "✅ Starting Google Trends scraper worker..."
+        exec python src/worker.py
+    fi
+    
     echo ""
-    echo "✅ Starting Google Trends API (Production Mode)..."
+    echo "✅ Starting Google Trends API (Production Mode, RUN_MODE=${RUN_MODE:-all})..."
     echo "   Port: 8000"
     echo ""
     
@@ -2,7 +2,7 @@
 import sys
 sys.path.insert(0, 'src')
 
-from main import scrape_google_trends
+from scraper import scrape_google_trends
 
 print("=" * 70)
 print("Testing Google Trends Scraping Locally")
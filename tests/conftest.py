@@ -0,0 +1,31 @@
+"""
+Shared test setup: import the app's pure modules straight from src/ and
+keep the snapshot store out of the working tree.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="trends-test-cache-"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+
+class FakeClock:
+    """Controllable replacement for time.time()"""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
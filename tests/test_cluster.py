@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+import cluster
+from catalog import CATEGORY_NAMES, KNOWN_GEOS
+from cluster import Cluster, HashRing, shard_key
+
+KEYS = [shard_key(geo, category_id) for geo in sorted(KNOWN_GEOS) for category_id in CATEGORY_NAMES]
+
+
+def owners(ring):
+    return {key: ring.owner(key) for key in KEYS}
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    before = owners(HashRing(["node-a", "node-b", "node-c"]))
+    after = owners(HashRing(["node-a", "node-b", "node-c", "node-d"]))
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert moved and all(after[key] == "node-d" for key in moved)
+    assert len(moved) < len(KEYS) / 2
+
+
+def test_removing_a_node_only_moves_its_keys():
+    before = owners(HashRing(["node-a", "node-b", "node-c"]))
+    after = owners(HashRing(["node-a", "node-c"]))
+
+    for key in KEYS:
+        if before[key] != "node-b":
+            assert after[key] == before[key]
+        else:
+            assert after[key] in ("node-a", "node-c")
+
+
+def test_empty_ring_owns_nothing():
+    assert HashRing([]).owner("IN:1") is None
+
+
+@pytest.fixture
+def static_cluster(tmp_path, monkeypatch):
+    """Cluster with node-a as this node and a static CLUSTER_CONFIG listing node-a and node-b"""
+    config = tmp_path / "cluster.json"
+    config.write_text(json.dumps({"nodes": {"node-a": "http://a:8000", "node-b": "http://b:8000"}}))
+    monkeypatch.setattr(cluster, "CLUSTER_CONFIG", str(config))
+    monkeypatch.setattr(cluster, "CLUSTER_DIR", None)
+    monkeypatch.setattr(cluster, "NODE_ID", "node-a")
+    node = Cluster()
+    yield node
+    node.stop()
+
+
+def test_member_owns_its_share(static_cluster):
+    static_cluster.start(join=True)
+
+    assert set(static_cluster.members) == {"node-a", "node-b"}
+    owned = [category_id for category_id in CATEGORY_NAMES if static_cluster.owns("IN", category_id)]
+    assert 0 < len(owned) < len(CATEGORY_NAMES)
+    assert static_cluster.describe()["role"] == "member"
+
+
+def test_observer_owns_nothing_and_drops_itself_from_static_nodes(static_cluster):
+    static_cluster.start(join=False)
+
+    assert set(static_cluster.members) == {"node-b"}
+    assert not any(static_cluster.owns("IN", category_id) for category_id in CATEGORY_NAMES)
+    assert all(static_cluster.owner("IN", category_id) == "node-b" for category_id in CATEGORY_NAMES)
+    assert static_cluster.peers_for_geo("IN") == ["node-b"]
+
+
+def test_observer_without_scraper_nodes_has_no_owner(tmp_path, monkeypatch):
+    monkeypatch.setattr(cluster, "CLUSTER_CONFIG", None)
+    monkeypatch.setattr(cluster, "CLUSTER_DIR", str(tmp_path))
+    monkeypatch.setattr(cluster, "NODE_ID", "api-1")
+    node = Cluster()
+    node.start(join=False)
+    try:
+        assert node.members == {}
+        assert node.owner("IN", 1) is None and not node.owns("IN", 1)
+        assert not list(tmp_path.glob("*.json"))  # Observers never heartbeat
+    finally:
+        node.stop()
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+import jobs
+from jobs import JobQueue, JobRejected
+
+
+@pytest.fixture
+def queue():
+    return JobQueue(concurrency=1, max_pending=2, cooldown_seconds=60)
+
+
+def blocking_job(release: threading.Event, result="done"):
+    def run(job):
+        release.wait(5)
+        return result
+    return run
+
+
+def test_submit_runs_job_and_resolves_future(queue):
+    job, created = queue.submit("IN_all", lambda job: 42)
+    assert created
+    assert job.future.result(timeout=5) == 42
+    assert job.status == "completed"
+    assert queue.stats()["completed"] == 1
+
+
+def test_identical_keys_are_deduplicated_while_active(queue):
+    release = threading.Event()
+    first, created = queue.submit("IN_all", blocking_job(release))
+    second, created_again = queue.submit("IN_all", blocking_job(release))
+    assert created and not created_again
+    assert second is first
+    release.set()
+    assert first.future.result(timeout=5) == "done"
+    assert queue.stats()["deduplicated"] == 1
+
+
+def test_cooldown_rejects_resubmission_unless_ignored(queue):
+    job, _ = queue.submit("IN_all", lambda job: 1)
+    job.future.result(timeout=5)
+
+    with pytest.raises(JobRejected) as excinfo:
+        queue.submit("IN_all", lambda job: 2)
+    assert excinfo.value.reason == "cooldown"
+    assert 0 < excinfo.value.retry_after <= 60
+    assert excinfo.value.last_job is job
+
+    again, created = queue.submit("IN_all", lambda job: 2, respect_cooldown=False)
+    assert created and again.future.result(timeout=5) == 2
+
+
+def test_full_backlog_is_rejected(queue):
+    release = threading.Event()
+    running, _ = queue.submit("running", blocking_job(release))
+    while running.status != "running":
+        time.sleep(0.01)
+    queue.submit("a", blocking_job(release))
+    queue.submit("b", blocking_job(release))
+    with pytest.raises(JobRejected) as excinfo:
+        queue.submit("c", blocking_job(release))
+    assert excinfo.value.reason == "queue_full"
+    release.set()
+
+
+def test_failed_job_sets_exception_and_releases_key(queue):
+    def boom(job):
+        raise ValueError("scrape failed")
+
+    job, _ = queue.submit("IN_all", boom)
+    with pytest.raises(ValueError):
+        job.future.result(timeout=5)
+    assert job.status == "failed" and job.error == "scrape failed"
+    assert queue.stats()["failed"] == 1
+
+
+def test_progress_and_update_hook(queue):
+    updates = []
+    queue.on_update = lambda job: updates.append(job.status)
+
+    def run(job):
+        job.set_progress(completed_categories=1, total_categories=2)
+        return None
+
+    job, _ = queue.submit("IN_all", run)
+    job.future.result(timeout=5)
+    assert job.to_dict()["progress"] == {"completed_categories": 1, "total_categories": 2}
+    assert updates[-1] == "completed"
+    assert "running" in updates
+
+
+def test_list_jobs_limit_is_clamped(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_HISTORY_SIZE", 3)
+    for i in range(5):
+        queue.submit(f"key{i}", lambda job: None)[0].future.result(timeout=5)
+    assert len(queue.list_jobs(0)) == 1
+    assert len(queue.list_jobs(-5)) == 1
+    assert len(queue.list_jobs(1000)) == 3
+    assert queue.list_jobs(2)[0]["key"] == "key4"
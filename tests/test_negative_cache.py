@@ -0,0 +1,73 @@
+import pytest
+
+import negative_cache
+from negative_cache import NegativeCache
+
+
+@pytest.fixture
+def cache(clock, monkeypatch):
+    monkeypatch.setattr(negative_cache.time, "time", clock)
+    monkeypatch.setattr(negative_cache, "REASON_TTLS", {"empty": 100, "no_trends": 100, "scrape_failed": 10})
+    monkeypatch.setattr(negative_cache, "NEGATIVE_TTL_MAX", 1000)
+    return NegativeCache(max_entries=3)
+
+
+def test_reasons_have_their_own_ttl(cache, clock):
+    assert cache.record("IN_autos", "empty", "none").expires_at == clock.now + 100
+    assert cache.record("IN_games", "scrape_failed", "boom").expires_at == clock.now + 10
+
+
+def test_repeated_misses_back_off_up_to_the_cap(cache, clock):
+    ttls = [cache.record("IN_autos", "empty", "none").expires_at - clock.now for _ in range(6)]
+    assert ttls == [100, 200, 400, 800, 1000, 1000]
+    assert cache.get("IN_autos").misses == 6
+
+
+def test_changing_reason_resets_backoff(cache, clock):
+    cache.record("IN_autos", "empty", "none")
+    cache.record("IN_autos", "empty", "none")
+    entry = cache.record("IN_autos", "scrape_failed", "boom")
+    assert entry.misses == 1 and entry.expires_at == clock.now + 10
+
+
+def test_get_counts_hits_and_discard_clears(cache):
+    assert cache.get("IN_autos") is None
+    cache.record("IN_autos", "empty", "none")
+    assert cache.get("IN_autos").reason == "empty"
+    cache.discard("IN_autos")
+    assert cache.get("IN_autos") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["cleared"] == 1
+
+
+def test_expired_entries_keep_answering_until_rechecked(cache, clock):
+    cache.record("IN_autos", "scrape_failed", "boom")
+    assert cache.due_for_recheck() == []
+    clock.advance(11)
+    assert cache.get("IN_autos") is not None
+
+    due = cache.due_for_recheck()
+    assert [entry.key for entry in due] == ["IN_autos"]
+    assert cache.due_for_recheck() == []  # Handed out once
+
+    cache.recheck_done(due[0])
+    assert [entry.key for entry in cache.due_for_recheck()] == ["IN_autos"]
+
+
+def test_idle_entries_are_dropped_instead_of_rechecked(cache, clock):
+    cache.record("IN_autos", "empty", "none")
+    clock.advance(1001)
+    assert cache.due_for_recheck() == []
+    assert len(cache) == 0
+    assert cache.stats()["dropped_idle"] == 1
+
+
+def test_entry_count_is_bounded(cache, clock):
+    for key in ["a_x", "b_x", "c_x"]:
+        cache.record(key, "empty", "none")
+        clock.advance(1)
+    cache.get("a_x")  # Recently asked for, so kept
+    cache.record("d_x", "empty", "none")
+    assert len(cache) == 3
+    assert cache.get("b_x") is None
+    assert cache.get("a_x") is not None
@@ -0,0 +1,94 @@
+import pytest
+
+import refresh
+from catalog import CATEGORY_NAMES
+
+AUTOS, GAMES, SPORTS = 1, 6, 17
+
+
+class FakeScraper:
+    """Stand-in for scrape_category: canned rows, empty results or errors per category id"""
+
+    def __init__(self):
+        self.results = {}
+
+    def __call__(self, url, category_name, category_id):
+        result = self.results.get(category_id, [{"title": f"{category_name} trend"}])
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    scraper = FakeScraper()
+    monkeypatch.setattr(refresh, "scrape_category", scraper)
+    monkeypatch.setattr(refresh.time, "sleep", lambda seconds: None)
+    return scraper
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """In-memory snapshot store behind save_to_disk/load_from_disk"""
+    saved = {}
+    monkeypatch.setattr(refresh, "save_to_disk", lambda geo, data, category=None: saved.__setitem__(geo, data))
+    monkeypatch.setattr(refresh, "load_from_disk", lambda geo, category=None, max_age=None: saved.get(geo))
+    return saved
+
+
+def titles(snapshot, category_id):
+    return [trend["title"] for trend in snapshot["trends"] if trend["category_id"] == category_id]
+
+
+def test_every_category_is_published_as_a_new_version(scraper, store):
+    published = []
+    snapshot = refresh.fetch_all_trends_for_geo("IN", on_snapshot=lambda key, data: published.append((key, data)))
+
+    assert [data["version"] for _, data in published] == list(range(1, len(CATEGORY_NAMES) + 1))
+    assert {key for key, _ in published} == {"IN_all"}
+    assert published[0][1]["refresh_in_progress"] and not snapshot["refresh_in_progress"]
+    assert snapshot["successful_categories"] == len(CATEGORY_NAMES)
+    assert store["IN"] is snapshot
+
+    again = refresh.fetch_all_trends_for_geo("IN")
+    assert again["version"] == 2 * len(CATEGORY_NAMES)
+
+
+def test_failed_category_keeps_its_last_good_data(scraper, store):
+    refresh.fetch_all_trends_for_geo("IN")
+    scraper.results[AUTOS] = RuntimeError("chrome crashed")
+
+    snapshot = refresh.fetch_all_trends_for_geo("IN")
+
+    assert titles(snapshot, AUTOS) == ["Autos and vehicles trend"]
+    freshness = snapshot["category_freshness"]["Autos and vehicles"]
+    assert freshness["status"] == "failed"
+    assert freshness["error"] == "chrome crashed"
+    assert freshness["total_trends"] == 1 and freshness["updated_at"]
+    assert snapshot["failed_categories"] == 1
+
+
+def test_empty_category_drops_its_trends(scraper, store):
+    refresh.fetch_all_trends_for_geo("IN")
+    scraper.results[GAMES] = []
+
+    snapshot = refresh.fetch_all_trends_for_geo("IN")
+
+    assert titles(snapshot, GAMES) == []
+    assert snapshot["category_freshness"]["Games"]["status"] == "empty"
+    assert snapshot["empty_categories"] == 1
+
+
+def test_categories_not_yet_refreshed_keep_previous_trends(scraper, store):
+    refresh.fetch_all_trends_for_geo("IN")
+    scraper.results = {category_id: [{"title": "new"}] for category_id in CATEGORY_NAMES}
+
+    published = []
+    refresh.fetch_all_trends_for_geo("IN", on_snapshot=lambda key, data: published.append(data))
+
+    # Mid-run: categories before sports are refreshed, sports and later still serve the old run
+    mid_run = published[list(CATEGORY_NAMES).index(SPORTS) - 1]
+    assert titles(mid_run, AUTOS) == ["new"]
+    assert titles(mid_run, SPORTS) == ["Sports trend"]
+    assert "Sports" in mid_run["category_freshness"]
+    assert titles(published[-1], SPORTS) == ["new"]
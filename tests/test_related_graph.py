@@ -0,0 +1,105 @@
+import pytest
+
+from related_graph import GLOBAL_SCOPE, RelatedGraph
+
+
+def trend(title, breakdown="", category_id=1, category="Autos and vehicles"):
+    return {"trends": title, "trend_breakdown": breakdown, "category_id": category_id, "category": category}
+
+
+def snapshot(geo, *trends):
+    return {"geo": geo, "trends": list(trends)}
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    graph = RelatedGraph()
+    graph.applied = []
+    apply = graph._apply
+    monkeypatch.setattr(graph, "_apply", lambda group, sign: (graph.applied.append((group.category, sign)), apply(group, sign)))
+    return graph
+
+
+def neighbors(graph, scope, query):
+    result = graph.related(scope, query)
+    return {item["query"]: item["weight"] for item in result["related"]} if result else None
+
+
+def test_unchanged_category_is_not_reparsed(graph):
+    data = snapshot("IN", trend("tesla", "ev, elon musk"), trend("cricket", "ipl", 17, "Sports"))
+    graph.update("IN_all", data)
+    assert len(graph.applied) == 2
+
+    graph.update("IN_all", snapshot("IN", *data["trends"]))
+    assert len(graph.applied) == 2
+
+
+def test_changed_category_is_reapplied(graph):
+    graph.update("IN_all", snapshot("IN", trend("tesla", "ev"), trend("cricket", "ipl", 17, "Sports")))
+    graph.applied.clear()
+
+    graph.update("IN_all", snapshot("IN", trend("tesla", "model y"), trend("cricket", "ipl", 17, "Sports")))
+
+    assert graph.applied == [("Autos and vehicles", -1), ("Autos and vehicles", 1)]
+    assert neighbors(graph, "IN", "tesla") == {"model y": 1}
+    assert graph.related("IN", "ev") is None
+
+
+def test_category_missing_from_new_snapshot_is_removed(graph):
+    graph.update("IN_all", snapshot("IN", trend("tesla", "ev"), trend("cricket", "ipl", 17, "Sports")))
+
+    graph.update("IN_all", snapshot("IN", trend("tesla", "ev")))
+
+    assert graph.related("IN", "cricket") is None
+    assert graph.related(GLOBAL_SCOPE, "ipl") is None
+    assert graph.stats()["snapshot_groups"] == 1
+
+
+def test_remove_drops_a_snapshots_contribution_only(graph):
+    graph.update("IN_all", snapshot("IN", trend("tesla", "ev")))
+    graph.update("US_all", snapshot("US", trend("tesla", "cybertruck")))
+
+    graph.remove("IN_all")
+
+    assert graph.related("IN", "tesla") is None
+    assert neighbors(graph, GLOBAL_SCOPE, "tesla") == {"cybertruck": 1}
+    assert neighbors(graph, "US", "tesla") == {"cybertruck": 1}
+
+
+def test_empty_scopes_are_deleted(graph):
+    graph.update("IN_all", snapshot("IN", trend("tesla", "ev")))
+    graph.update("US_all", snapshot("US", trend("tesla", "ev")))
+
+    graph.remove("IN_all")
+    assert "IN" not in graph.stats()["terms"]
+
+    graph.remove("US_all")
+    assert graph.stats() == {"snapshot_groups": 0, "terms": {}, "edges": 0}
+
+
+def test_related_ranks_neighbors_by_weight(graph):
+    graph.update("IN_all", snapshot(
+        "IN",
+        trend("tesla", "ev, elon musk"),
+        trend("Tesla stock", "tesla, ev"),
+        trend("EV", "tesla", 17, "Sports")
+    ))
+
+    result = graph.related("IN", "  TESLA ", limit=2)
+
+    assert result["query"] == "tesla"
+    assert len(result["related"]) == 2
+    assert result["related"][0] == {"query": "ev", "weight": 3, "categories": ["Autos and vehicles", "Sports"]}
+    assert result["related"][1]["weight"] == 1
+    assert result["total_neighbors"] == 3
+    assert result["categories"] == ["Autos and vehicles", "Sports"]
+    assert graph.related("IN", "unknown") is None
+
+
+def test_global_scope_sums_geos(graph):
+    graph.update("IN_all", snapshot("IN", trend("tesla", "ev")))
+    graph.update("US_all", snapshot("US", trend("tesla", "ev, cybertruck")))
+
+    assert neighbors(graph, "IN", "tesla") == {"ev": 1}
+    assert neighbors(graph, GLOBAL_SCOPE, "tesla") == {"ev": 2, "cybertruck": 1}
+    assert graph.stats()["edges"] == 3
@@ -0,0 +1,87 @@
+import gzip
+import io
+import os
+
+import pytest
+
+import snapshot_bundle
+import snapshot_store
+from snapshot_bundle import BundleError, import_bundle, iter_bundle, read_bundle
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Point the snapshot store at an empty directory"""
+    def use(name):
+        directory = tmp_path / name
+        directory.mkdir(exist_ok=True)
+        monkeypatch.setattr(snapshot_store, "CACHE_DIR", directory)
+        return directory
+    return use
+
+
+def write_snapshot(geo, data, category=None, mtime=None):
+    snapshot_store.save_to_disk(geo, data, category)
+    if mtime is not None:
+        path = snapshot_store.get_cache_file(geo, category)
+        os.utime(path, (mtime, mtime))
+
+
+def build_bundle():
+    return b"".join(iter_bundle(snapshot_store.list_snapshot_files()))
+
+
+@pytest.fixture
+def bundle(store):
+    store("source")
+    write_snapshot("IN", {"geo": "IN", "trends": [{"trends": "héllo", "category_id": 17}]}, mtime=1_000_000)
+    write_snapshot("US", {"geo": "US", "trends": []}, category="sports", mtime=2_000_000)
+    return build_bundle()
+
+
+def test_round_trip(bundle):
+    entries = {key: (stored_at, data) for key, stored_at, data in read_bundle(io.BytesIO(bundle))}
+    assert set(entries) == {"IN_all", "US_sports"}
+    assert entries["IN_all"] == (1_000_000, {"geo": "IN", "trends": [{"trends": "héllo", "category_id": 17}]})
+
+
+def test_import_keeps_age_and_prefers_newer_local_copy(bundle, store):
+    store("replica")
+    write_snapshot("US", {"geo": "US", "trends": ["local"]}, category="sports", mtime=3_000_000)
+
+    stats = import_bundle(io.BytesIO(bundle))
+    assert stats == {"snapshots": 2, "imported": 1, "kept_local": 1}
+    assert snapshot_store.get_cache_file("IN").stat().st_mtime == 1_000_000
+    assert snapshot_store.load_from_disk("US", "sports")["trends"] == ["local"]
+
+
+def tamper(bundle, old, new):
+    return gzip.compress(gzip.decompress(bundle).replace(old, new))
+
+
+@pytest.mark.parametrize("corrupt, message", [
+    (lambda b: tamper(b, "héllo".encode("utf-8"), b"hallo"), "Checksum mismatch"),
+    (lambda b: gzip.compress(gzip.decompress(b).rsplit(b"\n", 2)[0] + b"\n"), "truncated"),
+    (lambda b: b[:len(b) // 2], "Unreadable"),
+    (lambda b: tamper(b, b'"version":1', b'"version":2'), "Unsupported bundle version"),
+    (lambda b: tamper(b, b'"US_sports"', b'"../x_sports"'), "Invalid snapshot key"),
+    (lambda b: tamper(b, b'"count":2', b'"count":3'), "trailer"),
+    (lambda b: gzip.compress(b'{"format":"other"}\n'), "Not a snapshot bundle"),
+])
+def test_corrupt_bundles_are_rejected(bundle, corrupt, message):
+    with pytest.raises(BundleError, match=message):
+        read_bundle(io.BytesIO(corrupt(bundle)))
+
+
+def test_rejected_bundle_writes_nothing(bundle, store):
+    replica = store("replica")
+    with pytest.raises(BundleError):
+        import_bundle(io.BytesIO(bundle[:len(bundle) // 2]))
+    assert list(replica.iterdir()) == []
+
+
+def test_seed_from_file(bundle, store, tmp_path):
+    path = tmp_path / "snapshots.jsonl.gz"
+    path.write_bytes(bundle)
+    store("replica")
+    assert snapshot_bundle.seed_cache(str(path))["imported"] == 2
@@ -0,0 +1,88 @@
+import snapshot_cache
+from snapshot_cache import SnapshotCache, estimate_size
+
+
+def make_cache(clock, monkeypatch, max_bytes=10_000, max_entries=10, ttl=60, pinned=(), evicted=None):
+    monkeypatch.setattr(snapshot_cache.time, "time", clock)
+    return SnapshotCache(
+        max_bytes=max_bytes,
+        max_entries=max_entries,
+        ttl_seconds=ttl,
+        is_pinned=lambda key: key in pinned,
+        on_evict=evicted.append if evicted is not None else None
+    )
+
+
+def test_get_set_and_stats(clock, monkeypatch):
+    cache = make_cache(clock, monkeypatch)
+    assert cache.set("IN_all", {"trends": [1, 2]})
+    assert cache.get("IN_all") == {"trends": [1, 2]}
+    assert cache.get("US_all") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["bytes"] == estimate_size({"trends": [1, 2]})
+
+
+def test_lru_evicts_least_recently_used_by_entry_count(clock, monkeypatch):
+    evicted = []
+    cache = make_cache(clock, monkeypatch, max_entries=2, evicted=evicted)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # b is now least recently used
+    cache.set("c", 3)
+    assert cache.keys() == ["a", "c"]
+    assert evicted == ["b"]
+    assert cache.stats()["evictions_lru"] == 1
+
+
+def test_lru_respects_byte_budget(clock, monkeypatch):
+    payload = "x" * 100
+    size = estimate_size(payload)
+    cache = make_cache(clock, monkeypatch, max_bytes=size * 2)
+    for key in ("a", "b", "c"):
+        cache.set(key, payload)
+    assert cache.keys() == ["b", "c"]
+    assert cache.stats()["bytes"] <= size * 2
+
+
+def test_pinned_keys_are_never_evicted(clock, monkeypatch):
+    cache = make_cache(clock, monkeypatch, max_entries=1, ttl=10, pinned={"IN_all"})
+    cache.set("IN_all", 1)
+    cache.set("XX_all", 2)
+    assert "IN_all" in cache and "XX_all" not in cache
+    clock.advance(3600)
+    assert cache.get("IN_all") == 1
+
+
+def test_ttl_expiry_uses_stored_at(clock, monkeypatch):
+    evicted = []
+    cache = make_cache(clock, monkeypatch, ttl=60, evicted=evicted)
+    cache.set("old", 1, stored_at=clock.now - 59)
+    cache.set("new", 2)
+    clock.advance(2)
+    assert cache.get("old") is None
+    assert cache.get("new") == 2
+    assert evicted == ["old"]
+    assert cache.stats()["evictions_ttl"] == 1
+
+
+def test_oversize_entry_rejected_and_replaced_value_reported(clock, monkeypatch):
+    evicted = []
+    cache = make_cache(clock, monkeypatch, max_bytes=50, evicted=evicted)
+    assert cache.set("a", "small")
+    assert not cache.set("a", "x" * 100)
+    assert "a" not in cache
+    assert evicted == ["a"]
+    assert cache.stats()["rejected_oversize"] == 1
+
+
+def test_pop_and_clear(clock, monkeypatch):
+    evicted = []
+    cache = make_cache(clock, monkeypatch, evicted=evicted)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    assert evicted == ["a"]
+    assert cache.clear() == 1
+    assert len(cache) == 0 and cache.stats()["bytes"] == 0